@@ -1,6 +1,7 @@
 #!/usr/bin/env python3
 
 import argparse
+import functools
 import os
 import platform
 import subprocess
@@ -228,6 +229,53 @@ def parse_arguments():
         default="all",
         help="Build specific libgodot target only (for CI)",
     )
+    parser.add_argument(
+        "--fetch-prebuilt",
+        type=str,
+        metavar="SOURCE",
+        default="",
+        help="Download the natives CI built for this godot submodule hash instead of compiling: "
+        "'github' (the godot-<hash> releases), a release download base URL, or a local mirror "
+        "directory containing godot-<hash>/. Missing variants are still built",
+    )
+    parser.add_argument(
+        "--affected",
+        action="store_true",
+        help="Only build what the godot changes since each product's last successful build can reach "
+        "(editor executable, glue, libgodot targets); explains every skip",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep running: rebuild the selected libgodot target whenever the godot source tree changes "
+        "(implies --no-editor --no-glue; pair with e.g. --target template_debug)",
+    )
+    parser.add_argument(
+        "--web-profile",
+        type=str,
+        choices=["size", "speed"],
+        default="",
+        help="Web only: optimize libgodot.a and the consumer's relink for download size (-Oz) or speed (-O3), "
+        "minify the release shell JS and write .br/.gz siblings (default: Godot's web defaults)",
+    )
+    parser.add_argument(
+        "--post-process",
+        action="store_true",
+        help="After the build, strip template_release libraries, split debug info into -symbols archives "
+        "and write deterministic libgodot-<rid>-<target>.zip release archives using all cores",
+    )
+    parser.add_argument(
+        "--archive-dir",
+        type=str,
+        default=os.path.join("godot", "bin", "archives"),
+        help="Where --post-process writes the archives",
+    )
+    parser.add_argument(
+        "--stage",
+        action="store_true",
+        help="Link the selected targets' natives into the platforms/twodog.<rid>/natives/ layout "
+        "`dotnet pack platforms` packs from (with --no-library: stage the existing build)",
+    )
     parser.add_argument(
         "--cache-path",
         type=str,
@@ -315,6 +363,99 @@ def run_with_live_output(cmd, cwd=None, description="Running command..."):
         )
 
 
+def run_parallel_with_live_output(jobs):
+    """Run several subprocesses at once under one live display: a line per
+    command with its elapsed time and latest output. jobs is a list of
+    (cmd, cwd, description) tuples."""
+    import threading
+
+    start_time = time.time()
+    states = []
+
+    def pump(state):
+        for line in iter(state["process"].stdout.readline, ""):
+            line_stripped = line.rstrip()
+            state["output"].append(line_stripped)
+            if line_stripped:
+                state["last_line"] = line_stripped
+        state["process"].wait()
+        state["elapsed"] = time.time() - start_time
+
+    def render():
+        display = Text()
+        for state in states:
+            done = state["elapsed"] is not None
+            mins, secs = divmod(int(state["elapsed"] if done else time.time() - start_time), 60)
+            display.append("  " if done else "+ ", style="bold cyan")
+            display.append(state["description"], style="bold cyan")
+            display.append(f" [{mins:02d}:{secs:02d}]", style="dim cyan")
+            display.append("\n  ")
+            display.append(state["last_line"][:120], style="dim")  # Limit line length
+            display.append("\n")
+        return display
+
+    with Live(console=console, refresh_per_second=4) as live:
+        for cmd, cwd, description in jobs:
+            process = subprocess.Popen(
+                cmd,
+                cwd=cwd,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                text=True,
+                bufsize=1,
+                universal_newlines=True,
+            )
+            state = {"process": process, "description": description, "output": [],
+                     "last_line": "", "elapsed": None}
+            state["thread"] = threading.Thread(target=pump, args=(state,), daemon=True)
+            state["thread"].start()
+            states.append(state)
+
+        while any(state["thread"].is_alive() for state in states):
+            live.update(render())
+            time.sleep(0.25)
+        live.update(render())
+        live.stop()
+
+    failed = [state for state in states if state["process"].returncode != 0]
+    for state in states:
+        mins, secs = divmod(int(state["elapsed"]), 60)
+        if state in failed:
+            console.print(
+                f"[bold red]✗ Failed:[/bold red] {state['description']} "
+                f"[dim cyan]({mins:02d}:{secs:02d})[/dim cyan]"
+            )
+            console.print()
+            console.print(
+                Panel(
+                    rich.markup.escape("\n".join(state["output"][-50:])),  # Show last 50 lines
+                    title="[bold red]Error Output (last 50 lines)[/bold red]",
+                    border_style="red",
+                )
+            )
+        else:
+            console.print(
+                f"[bold green]✓[/bold green] {state['description']} "
+                f"[dim cyan]({mins:02d}:{secs:02d})[/dim cyan]"
+            )
+    if failed:
+        sys.exit(failed[0]["process"].returncode)
+
+
+def file_sha256(path: str) -> str:
+    import hashlib
+
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        while chunk := f.read(1 << 20):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def format_size(size: int) -> str:
+    return f"{size / (1 << 20):.2f} MiB" if size >= 1 << 20 else f"{size / 1024:.1f} KiB"
+
+
 def show_build_config(args, platform_config: PlatformConfig):
     """Display build configuration in a nice table."""
     table = Table(title="Build Configuration", show_header=True, header_style="bold magenta")
@@ -326,6 +467,8 @@ def show_build_config(args, platform_config: PlatformConfig):
     table.add_row("Debug Symbols (separate)", args.debug_symbols)
     table.add_row("SCU Build", args.scu_build)
     table.add_row("Dev Build", args.dev_build)
+    if platform_config.godot_platform == Platform.WEB.value:
+        table.add_row("Web Profile", args.web_profile or "default")
 
     # Build steps
     table.add_row("─" * 30, "─" * 11)
@@ -391,31 +534,24 @@ def check_emscripten_version():
         )
 
 
-def build_libgodot_web(args):
-    """Build the web (emscripten) static library and assemble the packaging
-    payload under godot/bin/web/<target>/."""
-    console.print("\n[bold yellow]┌── Building libgodot (web static library) ──┐[/bold yellow]")
-
-    check_emscripten_version()
+def libgodot_targets(args, platform_config: PlatformConfig) -> list[str]:
+    """The libgodot targets selected by --target for this platform."""
+    if platform_config.godot_platform == Platform.WEB.value:
+        if args.target == "all":
+            return ["template_release", "template_debug"]
+        if args.target == "editor":
+            console.print("[bold red]The web platform has no editor target.[/bold red]")
+            sys.exit(1)
+        return [args.target]
 
     if args.target == "all":
-        targets = ["template_release", "template_debug"]
-    elif args.target == "editor":
-        console.print("[bold red]The web platform has no editor target.[/bold red]")
-        sys.exit(1)
-    else:
-        targets = [args.target]
-
-    web_dir = "web"
+        return ["template_release", "template_debug", "editor"]
+    return [args.target]
 
-    import shutil
 
-    for target in targets:
-        # scons only ever adds to the .web_zip staging dir; wipe it so files
-        # from a previous module set don't leak into this payload.
-        stale_zip = os.path.join("godot", "bin", ".web_zip")
-        if os.path.isdir(stale_zip):
-            shutil.rmtree(stale_zip)
+def libgodot_command(args, platform_config: PlatformConfig, target: str):
+    """The scons command line (and its display description) for one libgodot target."""
+    if platform_config.godot_platform == Platform.WEB.value:
         task_desc = f"Building libgodot (target={target}, platform=web, arch=wasm32)"
         cmd = [
             "scons",
@@ -437,47 +573,9 @@ def build_libgodot_web(args):
             # Allow --path override at runtime (needed for libgodot to load projects)
             "disable_path_overrides=no",
         ]
-        if args.cache_path:
-            cmd.append(f"cache_path={args.cache_path}")
-        run_with_live_output(cmd, cwd="godot", description=task_desc)
-
-        # Assemble the per-target packaging payload:
-        #   web/<target>/libgodot/  - static lib + emcc config + js glue
-        #                             (from the scons-staged template zip dir)
-        #   web/<target>/shell/     - the Godot engine boot shell the page
-        #                             loads (godot.js wraps mono_bridge +
-        #                             engine.js; plus audio worklets)
-        zip_dir = os.path.join("godot", "bin", ".web_zip")
-        src = os.path.join(zip_dir, "libgodot")
-        dst = os.path.join("godot", "bin", web_dir, target)
-        if not os.path.isfile(os.path.join(src, "libgodot.a")):
-            console.print(f"[bold red]Expected web payload not found at {src}[/bold red]")
-            sys.exit(1)
-        if os.path.isdir(dst):
-            shutil.rmtree(dst)
-        shutil.copytree(src, os.path.join(dst, "libgodot"))
-        shell_dst = os.path.join(dst, "shell")
-        os.makedirs(shell_dst)
-        for shell_file in ["godot.js", "godot.audio.worklet.js", "godot.audio.position.worklet.js"]:
-            shutil.copy2(os.path.join(zip_dir, shell_file), shell_dst)
-        console.print(f"[green]Web payload staged: {dst}[/green]")
-
-
-def build_libgodot(args, platform_config: PlatformConfig):
-    """Build the libgodot library."""
-    if platform_config.godot_platform == Platform.WEB.value:
-        build_libgodot_web(args)
-        return
-
-    console.print("\n[bold yellow]┌── Building libgodot ──┐[/bold yellow]")
-
-    # Determine which targets to build
-    if args.target == "all":
-        targets = ["template_release", "template_debug", "editor"]
+        if args.web_profile:
+            cmd.append(f"optimize={WEB_PROFILES[args.web_profile][0]}")
     else:
-        targets = [args.target]
-
-    for target in targets:
         # template_release should never be a dev build (for optimized release binaries)
         # editor target uses the configurable dev_build setting
         use_dev_build = "no" if target == "template_release" else args.dev_build
@@ -504,8 +602,217 @@ def build_libgodot(args, platform_config: PlatformConfig):
             # Allow --path override at runtime (needed for libgodot to load projects)
             "disable_path_overrides=no",
         ]
-        if args.cache_path:
-            cmd.append(f"cache_path={args.cache_path}")
+    if args.cache_path:
+        cmd.append(f"cache_path={args.cache_path}")
+    return cmd, task_desc
+
+
+# Shell files the page loads next to the app bundle (see WasmExtraFilesToDeploy
+# in 2dog.browser-wasm.targets).
+WEB_SHELL_FILES = ["godot.js", "godot.audio.worklet.js", "godot.audio.position.worklet.js"]
+
+# --web-profile: scons optimize= level for libgodot.a, and the emcc link
+# optimization (which also drives wasm-opt) for the consumer's relink of
+# dotnet.native.wasm, recorded in the payload's web-profile.txt. Both levels
+# exist in every emscripten 3.x, so they hold for the pinned version; the
+# larger size win, thin LTO, needs emscripten >= 4.0.9 and stays off (see
+# libgodot_command).
+WEB_PROFILES = {
+    "size": ("size_extra", "-Oz"),
+    "speed": ("speed", "-O3"),
+}
+WEB_PRECOMPRESS_MIN_SIZE = 4096  # Same cutoff as TwoDogPrecompressBundle.
+
+
+def clear_web_zip_staging():
+    """scons only ever adds to the .web_zip staging dir; wipe it so files
+    from a previous module set don't leak into the next payload."""
+    import shutil
+
+    stale_zip = os.path.join("godot", "bin", ".web_zip")
+    if os.path.isdir(stale_zip):
+        shutil.rmtree(stale_zip)
+
+
+def web_payload_sizes(payload_dir: str) -> dict:
+    """Byte sizes of a staged web payload (precompressed siblings excluded)."""
+    sizes = {"libgodot.a": 0, "shell": 0, "total": 0}
+    for dirpath, _, names in os.walk(payload_dir):
+        for name in names:
+            if name.endswith((".br", ".gz")):
+                continue
+            size = os.path.getsize(os.path.join(dirpath, name))
+            sizes["total"] += size
+            if name == "libgodot.a":
+                sizes["libgodot.a"] = size
+            elif name in WEB_SHELL_FILES:
+                sizes["shell"] += size
+    return sizes
+
+
+def find_terser() -> list[str] | None:
+    """The terser minifier emscripten ships (<emscripten>/node_modules), run
+    with emsdk's node."""
+    import shutil
+
+    emcc = shutil.which("emcc")
+    node = os.environ.get("EMSDK_NODE") or shutil.which("node")
+    if not emcc or not node:
+        return None
+    script = os.path.join(os.path.dirname(os.path.realpath(emcc)), "node_modules", "terser", "bin", "terser")
+    return [node, script] if os.path.isfile(script) else None
+
+
+@functools.cache
+def load_brotli():
+    """The optional brotli module (pip install brotli), or None - warned about once."""
+    try:
+        import brotli
+    except ImportError:
+        console.print("[bold yellow]Python brotli module not installed - writing only .gz shell siblings[/bold yellow]")
+        return None
+    return brotli
+
+
+def optimize_web_shell(shell_dir: str, minify: bool) -> dict:
+    """Minify the shell JS in place (top-level names such as Engine stay
+    intact for the page) and write .br/.gz siblings the consumer deploys
+    with it. Returns the shell's minified and compressed byte sizes."""
+    import gzip
+
+    brotli = load_brotli()
+    terser = find_terser() if minify else None
+    if minify and terser is None:
+        console.print("[bold yellow]terser not found next to emcc - shell JS left unminified[/bold yellow]")
+    sizes = {"minified": 0, "br": 0, "gz": 0}
+    for name in WEB_SHELL_FILES:
+        path = os.path.join(shell_dir, name)
+        if terser:
+            result = subprocess.run(
+                terser + [path, "--compress", "--mangle", "--comments", "some", "--output", path + ".min"],
+                capture_output=True,
+                text=True,
+            )
+            if result.returncode == 0:
+                os.replace(path + ".min", path)
+            else:
+                console.print(f"[bold yellow]terser failed on {name} - kept as is:[/bold yellow]\n{result.stderr.strip()}")
+        with open(path, "rb") as f:
+            data = f.read()
+        sizes["minified"] += len(data)
+        if len(data) < WEB_PRECOMPRESS_MIN_SIZE:
+            continue
+        # mtime=0: identical input gives identical siblings (and packages).
+        siblings = {"gz": gzip.compress(data, 9, mtime=0)}
+        if brotli is not None:
+            siblings["br"] = brotli.compress(data, quality=11)
+        for suffix, compressed in siblings.items():
+            with open(f"{path}.{suffix}", "wb") as f:
+                f.write(compressed)
+            sizes[suffix] += len(compressed)
+    return sizes
+
+
+def stage_web_payload(target: str, profile: str = "") -> dict:
+    """Assemble the per-target packaging payload:
+      web/<target>/libgodot/  - static lib + emcc config + js glue
+                                (from the scons-staged template zip dir)
+      web/<target>/shell/     - the Godot engine boot shell the page
+                                loads (godot.js wraps mono_bridge +
+                                engine.js; plus audio worklets)
+      web/<target>/web-profile.txt - the --web-profile it was built with
+    Returns the payload sizes before (previous build) and after staging."""
+    import shutil
+
+    zip_dir = os.path.join("godot", "bin", ".web_zip")
+    src = os.path.join(zip_dir, "libgodot")
+    dst = os.path.join("godot", "bin", "web", target)
+    if not os.path.isfile(os.path.join(src, "libgodot.a")):
+        console.print(f"[bold red]Expected web payload not found at {src}[/bold red]")
+        sys.exit(1)
+    report = {"target": target, "profile": profile or "default", "previous": None}
+    if os.path.isdir(dst):
+        report["previous"] = web_payload_sizes(dst)
+        shutil.rmtree(dst)
+    shutil.copytree(src, os.path.join(dst, "libgodot"))
+    shell_dst = os.path.join(dst, "shell")
+    os.makedirs(shell_dst)
+    for shell_file in WEB_SHELL_FILES:
+        shutil.copy2(os.path.join(zip_dir, shell_file), shell_dst)
+    report["shell_raw"] = web_payload_sizes(dst)["shell"]
+    if profile:
+        # The debug shell stays readable for devtools.
+        report.update(optimize_web_shell(shell_dst, minify=target == "template_release"))
+        with open(os.path.join(dst, "web-profile.txt"), "w", encoding="utf-8") as f:
+            f.write(f"{profile}\n")
+    report["current"] = web_payload_sizes(dst)
+    console.print(f"[green]Web payload staged: {dst}[/green]")
+    return report
+
+
+def show_web_payload_report(reports: list[dict]):
+    """Payload sizes per target, with the delta against the previously staged build."""
+
+    def with_delta(current, previous):
+        if previous is None:
+            return format_size(current)
+        change = current - previous
+        percent = f" ({change / previous:+.1%})" if previous else ""
+        return f"{format_size(current)}\n[dim]Δ {'+' if change >= 0 else '-'}{format_size(abs(change))}{percent}[/dim]"
+
+    table = Table(
+        title=f"Web payload (emscripten {read_pinned_emscripten_version() or '?'})",
+        show_header=True,
+        header_style="bold magenta",
+    )
+    for column in ["Target", "Profile", "libgodot.a", "Shell JS", "Shell .br / .gz", "Payload"]:
+        table.add_column(column, style="cyan" if column == "Target" else "green", no_wrap=True,
+                         justify="left" if column in ("Target", "Profile") else "right")
+    for report in reports:
+        previous, current = report["previous"], report["current"]
+        shell = format_size(report["shell_raw"])
+        if "minified" in report and report["minified"] != report["shell_raw"]:
+            shell += f"\n[dim]minified {format_size(report['minified'])}[/dim]"
+        compressed = " / ".join(format_size(report[suffix]) if report.get(suffix) else "-" for suffix in ("br", "gz"))
+        table.add_row(
+            report["target"],
+            report["profile"],
+            with_delta(current["libgodot.a"], previous and previous["libgodot.a"]),
+            shell,
+            compressed if "gz" in report else "-",
+            with_delta(current["total"], previous and previous["total"]),
+        )
+    console.print(table)
+
+
+def build_libgodot_web(args, platform_config: PlatformConfig, targets: list[str]):
+    """Build the web (emscripten) static library and assemble the packaging
+    payload under godot/bin/web/<target>/."""
+    console.print("\n[bold yellow]┌── Building libgodot (web static library) ──┐[/bold yellow]")
+
+    check_emscripten_version()
+
+    reports = []
+    for target in targets:
+        clear_web_zip_staging()
+        cmd, task_desc = libgodot_command(args, platform_config, target)
+        run_with_live_output(cmd, cwd="godot", description=task_desc)
+        reports.append(stage_web_payload(target, args.web_profile))
+    show_web_payload_report(reports)
+
+
+def build_libgodot(args, platform_config: PlatformConfig, targets: list[str] | None = None):
+    """Build the libgodot library (all --target targets unless given)."""
+    if targets is None:
+        targets = libgodot_targets(args, platform_config)
+    if platform_config.godot_platform == Platform.WEB.value:
+        build_libgodot_web(args, platform_config, targets)
+        return
+
+    console.print("\n[bold yellow]┌── Building libgodot ──┐[/bold yellow]")
+
+    for target in targets:
+        cmd, task_desc = libgodot_command(args, platform_config, target)
         run_with_live_output(cmd, cwd="godot", description=task_desc)
 
 
@@ -550,6 +857,1121 @@ def generate_glue(platform_config: PlatformConfig):
         description=task_desc,
     )
 
+# Release assets of build-natives.yml, keyed by what they replace. Desktop
+# zips hold the library under its Godot file name (unpacked into godot/bin/),
+# web zips hold the whole godot/bin/web/<target>/ payload.
+PREBUILT_RIDS = {
+    ("linuxbsd", "x86_64"): "linux-x64",
+    ("windows", "x86_64"): "win-x64",
+    ("macos", "arm64"): "osx-arm64",
+    ("web", "wasm32"): "browser-wasm",
+}
+PREBUILT_GLUE_ASSETS = {
+    "godotsharp": "godot/bin/GodotSharp",
+    "godotsharp-nupkgs": "godot/bin/GodotSharp/Tools/nupkgs",
+    "godot-source-generators": "godot/modules/mono/editor/Godot.NET.Sdk/Godot.SourceGenerators/bin/Release/netstandard2.0",
+}
+PREBUILT_EDITOR_ASSETS = {"linux-x64": "godot-editor-linux-x64"}
+PREBUILT_DEFAULT_SOURCE = "https://github.com/outfox/2dog/releases/download"
+PREBUILT_CACHE = os.path.join("godot", "bin", ".prebuilt")
+# The options build-natives.yml builds the published assets with (what
+# --affected records for fetched products).
+PREBUILT_BUILD_OPTIONS = {"dev_build": "no", "scu_build": "yes", "debug_symbols": "no", "web_profile": ""}
+
+
+def godot_submodule_hash() -> str:
+    """The committed godot submodule pointer, shortened like CI's natives tag
+    (`git ls-tree HEAD godot | cut -c1-7`)."""
+    out = subprocess.run(["git", "ls-tree", "HEAD", "godot"], capture_output=True, text=True, check=True)
+    return out.stdout.split()[2][:7]
+
+
+def godot_submodule_pristine(submodule_hash: str) -> bool:
+    """True when godot/ is checked out at the committed pointer with no local edits,
+    i.e. when prebuilt natives for that pointer are what a build would produce."""
+    head = subprocess.run(["git", "-C", "godot", "rev-parse", "HEAD"], capture_output=True, text=True)
+    status = subprocess.run(
+        ["git", "-C", "godot", "status", "--porcelain", "--untracked-files=no"], capture_output=True, text=True
+    )
+    return head.returncode == 0 and head.stdout.startswith(submodule_hash) and not status.stdout.strip()
+
+
+def fetch_asset(source: str, name: str, dest: str) -> str:
+    """Copy or download one release asset to dest, resuming a partial download."""
+    import shutil
+    import urllib.error
+    import urllib.request
+
+    if os.path.isfile(dest):
+        return dest
+    if not source.startswith(("http://", "https://")):
+        src = os.path.join(source, name)
+        if not os.path.isfile(src):
+            raise FileNotFoundError(src)
+        shutil.copyfile(src, dest + ".part")
+        os.replace(dest + ".part", dest)
+        return dest
+
+    partial = dest + ".part"
+    offset = os.path.getsize(partial) if os.path.exists(partial) else 0
+    request = urllib.request.Request(f"{source}/{name}", headers={"User-Agent": "2dog-build-godot"})
+    if offset:
+        request.add_header("Range", f"bytes={offset}-")
+    try:
+        with urllib.request.urlopen(request, timeout=60) as response:
+            # 206: the server honoured the Range header; 200: start over.
+            mode = "ab" if offset and response.status == 206 else "wb"
+            with open(partial, mode) as f:
+                shutil.copyfileobj(response, f, 1 << 20)
+    except urllib.error.HTTPError as e:
+        if e.code == 416:  # Range beyond the end: the partial file is complete.
+            pass
+        elif e.code == 404:
+            raise FileNotFoundError(f"{source}/{name}") from e
+        else:
+            raise
+    os.replace(partial, dest)
+    return dest
+
+
+def read_checksums(source: str, cache_dir: str) -> dict:
+    """name -> sha256 from the release's SHA256SUMS (empty for releases that predate it)."""
+    path = os.path.join(cache_dir, "SHA256SUMS")
+    if os.path.isfile(path):
+        os.remove(path)  # Always re-read: a forced natives rebuild replaces the release.
+    try:
+        fetch_asset(source, "SHA256SUMS", path)
+    except FileNotFoundError:
+        return {}
+    checksums = {}
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            parts = line.split()
+            if len(parts) == 2:
+                checksums[parts[1].lstrip("*")] = parts[0].lower()
+    return checksums
+
+
+def verify_asset(path: str, expected: str | None) -> bool:
+    import zipfile
+
+    if expected:
+        return file_sha256(path) == expected
+    try:
+        with zipfile.ZipFile(path) as archive:
+            return archive.testzip() is None
+    except zipfile.BadZipFile:
+        return False
+
+
+def unpack_asset(path: str, dest: str):
+    """Unzip into dest, restoring the unix permissions `zip` recorded (editor executable)."""
+    import zipfile
+
+    os.makedirs(dest, exist_ok=True)
+    with zipfile.ZipFile(path) as archive:
+        for info in archive.infolist():
+            extracted = archive.extract(info, dest)
+            mode = info.external_attr >> 16
+            if mode and not info.is_dir():
+                os.chmod(extracted, mode & 0o777)
+
+
+def fetch_prebuilt(args, platform_config: PlatformConfig, targets: list[str] | None = None) -> dict:
+    """--fetch-prebuilt: pull the natives build-natives.yml published for this
+    submodule hash instead of compiling them (only the given libgodot targets,
+    default: all requested ones). Returns what still has to be built:
+    {"editor": bool, "glue": bool, "targets": [...]}."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    if targets is None:
+        targets = [] if args.no_library else libgodot_targets(args, platform_config)
+    remaining = {"editor": not args.no_editor, "glue": not args.no_glue, "targets": targets}
+
+    console.print("\n[bold yellow]┌── Fetching prebuilt natives ──┐[/bold yellow]")
+    rid = PREBUILT_RIDS.get((platform_config.godot_platform, platform_config.godot_arch))
+    submodule_hash = godot_submodule_hash()
+    if rid is None:
+        console.print(f"[bold yellow]No prebuilt natives for {platform_config.godot_platform}/"
+                      f"{platform_config.godot_arch} - building everything[/bold yellow]")
+        return remaining
+    if not godot_submodule_pristine(submodule_hash):
+        console.print("[bold yellow]godot/ differs from the committed submodule pointer "
+                      f"{submodule_hash} - prebuilt natives would not match, building[/bold yellow]")
+        return remaining
+
+    source = PREBUILT_DEFAULT_SOURCE if args.fetch_prebuilt == "github" else args.fetch_prebuilt
+    source = f"{source.rstrip('/')}/godot-{submodule_hash}"
+    cache_dir = os.path.join(PREBUILT_CACHE, f"godot-{submodule_hash}")
+    os.makedirs(cache_dir, exist_ok=True)
+
+    # asset name -> (what it replaces, where it unpacks)
+    wanted = {}
+    for target in targets:
+        dest = os.path.join("godot", "bin", "web", target) if rid == "browser-wasm" else os.path.join("godot", "bin")
+        wanted[f"libgodot-{rid}-{target}"] = (target, dest)
+    if remaining["glue"]:
+        for name, dest in PREBUILT_GLUE_ASSETS.items():
+            wanted[name] = ("glue", dest)
+    if remaining["editor"] and rid in PREBUILT_EDITOR_ASSETS:
+        wanted[PREBUILT_EDITOR_ASSETS[rid]] = ("editor", os.path.join("godot", "bin"))
+    if not wanted:
+        return remaining
+
+    checksums = read_checksums(source, cache_dir)
+    if not checksums:
+        console.print("[bold yellow]Release has no SHA256SUMS - verifying zip integrity only[/bold yellow]")
+    console.print(f"[cyan]Source:[/cyan] {source} ({len(wanted)} asset(s))")
+
+    def fetch(name):
+        path = os.path.join(cache_dir, f"{name}.zip")
+        try:
+            fetch_asset(source, f"{name}.zip", path)
+        except (OSError, ValueError) as e:
+            return name, f"unavailable ({e})"
+        if not verify_asset(path, checksums.get(f"{name}.zip")):
+            os.remove(path)
+            return name, "checksum mismatch - discarded"
+        return name, None
+
+    with ThreadPoolExecutor(max_workers=min(8, len(wanted))) as pool:
+        results = list(pool.map(fetch, wanted))
+
+    fetched = set()
+    for name, error in results:
+        replaces, dest = wanted[name]
+        if error:
+            console.print(f"[bold yellow]✗ {name}: {error}[/bold yellow]")
+            continue
+        if replaces in targets and rid == "browser-wasm" and os.path.isdir(dest):
+            import shutil
+
+            shutil.rmtree(dest)  # Same contract as stage_web_payload: no stale files.
+        unpack_asset(os.path.join(cache_dir, f"{name}.zip"), dest)
+        console.print(f"[bold green]✓[/bold green] {name} → {dest}")
+        fetched.add(name)
+
+    glue_fetched = remaining["glue"] and set(PREBUILT_GLUE_ASSETS) <= fetched
+    editor_fetched = PREBUILT_EDITOR_ASSETS.get(rid) in fetched
+    remaining["glue"] = remaining["glue"] and not glue_fetched
+    # The editor executable exists to generate the glue: build it only when
+    # neither it nor the glue could be fetched.
+    remaining["editor"] = remaining["editor"] and not editor_fetched and not glue_fetched
+    remaining["targets"] = [t for t in targets if f"libgodot-{rid}-{t}" not in fetched]
+    return remaining
+
+
+# Post-processing of the built natives (--post-process): strip, debug-info
+# split and the release archives, one job per library on a thread pool (the
+# work happens in strip/objcopy subprocesses and in zlib, which releases the
+# GIL while compressing).
+ARCHIVE_CHUNK = 1 << 20  # Deflate input per job; fixed so the output never depends on the core count.
+ARCHIVE_LEVEL = 9  # Same as the release job's `zip -9`.
+ARCHIVE_DOS_TIME = (0, (1 << 5) | 1)  # 1980-01-01 00:00, the earliest zip timestamp.
+
+
+def native_library_name(platform_config: PlatformConfig, target: str) -> str:
+    """The Godot file name of a shared library (see NativeLibPath in platforms/Directory.Build.targets)."""
+    return (
+        f"{platform_config.lib_prefix}.{platform_config.godot_platform}.{target}."
+        f"{platform_config.godot_arch}.shared_library{platform_config.lib_extension}"
+    )
+
+
+def run_quiet(cmd, cwd=None):
+    """Run a short tool invocation; raise with its output when it fails."""
+    result = subprocess.run(cmd, cwd=cwd, capture_output=True, text=True)
+    if result.returncode != 0:
+        raise RuntimeError(f"{' '.join(cmd)} failed:\n{result.stdout}{result.stderr}")
+
+
+def elf_build_id(path: str) -> str:
+    """The GNU build-id note of an ELF file ("" when it was linked without one)."""
+    import re
+
+    out = subprocess.run(["readelf", "-n", path], capture_output=True, text=True)
+    m = re.search(r"Build ID:\s*([0-9a-f]+)", out.stdout)
+    return m.group(1) if m else ""
+
+
+def elf_has_debuglink(path: str) -> bool:
+    out = subprocess.run(["readelf", "-S", "-W", path], capture_output=True, text=True)
+    return ".gnu_debuglink" in out.stdout
+
+
+def split_debug_info(platform_config: PlatformConfig, library: str, strip: bool):
+    """Move the debug info (and, with strip, the local symbols) of a library
+    into a side file the debugger finds again. Returns the symbol files and
+    build-id symlinks as two lists of (path or link target, archive name),
+    the files scons' separate_debug_symbols left behind included. Running it
+    again on a processed library is a no-op."""
+    import shutil
+
+    platform_name = platform_config.godot_platform
+    tools = {Platform.LINUX.value: ["objcopy", "strip", "readelf"], Platform.MACOS.value: ["dsymutil", "strip"]}
+    missing = [tool for tool in tools.get(platform_name, []) if not shutil.which(tool)]
+    if strip and missing:
+        console.print(f"[bold yellow]{', '.join(missing)} not found - {os.path.basename(library)} "
+                      "left unstripped[/bold yellow]")
+        strip = False
+    symbols, links = [], []
+    if platform_name == Platform.LINUX.value:
+        debug_file = library + ".debug"
+        if strip and not elf_has_debuglink(library):
+            run_quiet(["objcopy", "--only-keep-debug", library, debug_file])
+            run_quiet(["strip", "--strip-unneeded", library])
+            # --add-gnu-debuglink needs the debug file's basename resolvable from the cwd.
+            run_quiet(["objcopy", f"--add-gnu-debuglink={os.path.basename(debug_file)}",
+                       os.path.basename(library)], cwd=os.path.dirname(library))
+        if os.path.isfile(debug_file):
+            symbols.append((debug_file, os.path.basename(debug_file)))
+            build_id = elf_build_id(library) if not missing else ""
+            if build_id:
+                # gdb/lldb/debuginfod layout: .build-id/ab/cdef....debug
+                links.append((f"../../{os.path.basename(debug_file)}", f".build-id/{build_id[:2]}/{build_id[2:]}.debug"))
+    elif platform_name == Platform.MACOS.value:
+        dsym = library + ".dSYM"
+        if strip and not os.path.isdir(dsym):
+            # dsymutil indexes the DWARF by the library's LC_UUID.
+            run_quiet(["dsymutil", library, "-o", dsym])
+            run_quiet(["strip", "-x", library])
+            run_quiet(["codesign", "--force", "--sign", "-", library])  # strip invalidates the ad-hoc signature.
+        for dirpath, _, filenames in os.walk(dsym):
+            for name in filenames:
+                path = os.path.join(dirpath, name)
+                symbols.append((path, os.path.relpath(path, os.path.dirname(library)).replace(os.sep, "/")))
+    elif platform_name == Platform.WINDOWS.value:
+        # MSVC keeps debug info out of the DLL already; just ship the PDB.
+        pdb = os.path.splitext(library)[0] + ".pdb"
+        if os.path.isfile(pdb):
+            symbols.append((pdb, os.path.basename(pdb)))
+    return symbols, links
+
+
+def deflate_chunk(chunk: bytes, previous: bytes, last: bool) -> bytes:
+    """Raw-deflate one chunk primed with the tail of the previous one (pigz's
+    scheme): the chunks concatenate into a single valid deflate stream, so a
+    large library compresses on every core yet unzips with any tool."""
+    import zlib
+
+    if previous:
+        compressor = zlib.compressobj(ARCHIVE_LEVEL, zlib.DEFLATED, -15, zdict=previous[-32768:])
+    else:
+        compressor = zlib.compressobj(ARCHIVE_LEVEL, zlib.DEFLATED, -15)
+    return compressor.compress(chunk) + compressor.flush(zlib.Z_FINISH if last else zlib.Z_SYNC_FLUSH)
+
+
+def write_archive(path: str, files: list[tuple[str, str]], pool, workers: int, links=()) -> None:
+    """Write a zip of (source path, archive name) files and (link target,
+    archive name) symlinks in name order with fixed timestamps and
+    permissions, deflating chunks of each file on the pool."""
+    import struct
+    import zlib
+    from collections import deque
+
+    central = []
+    entries = [(source, name, False) for source, name in files] + [(target, name, True) for target, name in links]
+    with open(path + ".part", "wb") as out:
+        for source, name, is_link in sorted(entries, key=lambda entry: entry[1]):
+            encoded = name.encode("utf-8")
+            flags = 0 if encoded.isascii() else 0x800
+            if is_link:
+                data = source.encode("utf-8")
+                size, mode = len(data), 0o120777
+            else:
+                size = os.path.getsize(source)
+                mode = 0o100755 if os.access(source, os.X_OK) or name.endswith((".so", ".dylib", ".dll")) else 0o100644
+            method = 8 if size and not is_link else 0
+            zip64 = size >= 0xFFFF0000  # Deflate can grow incompressible data slightly.
+            offset = out.tell()
+            extra = struct.pack("<HHQQ", 1, 16, 0, 0) if zip64 else b""
+            out.write(struct.pack("<IHHHHHIIIHH", 0x04034B50, 45 if zip64 else 20, flags, method,
+                                  *ARCHIVE_DOS_TIME, 0, 0, 0, len(encoded), len(extra)))
+            out.write(encoded + extra)
+
+            crc, compressed = 0, 0
+            if is_link or not method:
+                if is_link:
+                    out.write(data)
+                    crc = zlib.crc32(data)
+                compressed = size
+            else:
+                pending = deque()
+                with open(source, "rb") as f:
+                    previous, chunk = b"", f.read(ARCHIVE_CHUNK)
+                    while chunk:
+                        following = f.read(ARCHIVE_CHUNK)
+                        crc = zlib.crc32(chunk, crc)
+                        pending.append(pool.submit(deflate_chunk, chunk, previous, not following))
+                        previous, chunk = chunk, following
+                        while len(pending) >= 2 * workers or (not chunk and pending):
+                            block = pending.popleft().result()
+                            out.write(block)
+                            compressed += len(block)
+
+            end = out.tell()
+            out.seek(offset + 14)
+            if zip64:
+                out.write(struct.pack("<III", crc, 0xFFFFFFFF, 0xFFFFFFFF))
+                out.seek(offset + 30 + len(encoded) + 4)
+                out.write(struct.pack("<QQ", size, compressed))
+            else:
+                out.write(struct.pack("<III", crc, compressed, size))
+            out.seek(end)
+            central.append((encoded, flags, method, crc, compressed, size, offset, mode))
+
+        directory_offset = out.tell()
+        for encoded, flags, method, crc, compressed, size, offset, mode in central:
+            fields = [v for v in (size, compressed, offset) if v >= 0xFFFFFFFF]
+            extra = struct.pack(f"<HH{len(fields)}Q", 1, 8 * len(fields), *fields) if fields else b""
+            out.write(struct.pack("<IHHHHHHIIIHHHHHII", 0x02014B50, (3 << 8) | 45, 45 if fields else 20,
+                                  flags, method, *ARCHIVE_DOS_TIME, crc,
+                                  min(compressed, 0xFFFFFFFF), min(size, 0xFFFFFFFF),
+                                  len(encoded), len(extra), 0, 0, 0, mode << 16, min(offset, 0xFFFFFFFF)))
+            out.write(encoded + extra)
+        directory_size = out.tell() - directory_offset
+        if directory_offset >= 0xFFFFFFFF:
+            zip64_end = out.tell()
+            out.write(struct.pack("<IQHHIIQQQQ", 0x06064B50, 44, (3 << 8) | 45, 45, 0, 0,
+                                  len(central), len(central), directory_size, directory_offset))
+            out.write(struct.pack("<IIQI", 0x07064B50, 0, zip64_end, 1))
+        out.write(struct.pack("<IHHHHIIH", 0x06054B50, 0, 0, len(central), len(central),
+                              directory_size, min(directory_offset, 0xFFFFFFFF), 0))
+    os.replace(path + ".part", path)
+
+
+def post_process_natives(args, platform_config: PlatformConfig, targets: list[str]):
+    """Strip template_release libraries, split their debug info into a
+    separate symbols archive (with .build-id links on Linux), and write the
+    deterministic libgodot-<rid>-<target>.zip release archives to
+    --archive-dir. Prints sizes and timings per target."""
+    from concurrent.futures import ThreadPoolExecutor
+
+    console.print("\n[bold yellow]┌── Post-processing natives ──┐[/bold yellow]")
+    rid = PREBUILT_RIDS.get(
+        (platform_config.godot_platform, platform_config.godot_arch),
+        f"{platform_config.godot_platform}-{platform_config.godot_arch}",
+    )
+    web = platform_config.godot_platform == Platform.WEB.value
+    os.makedirs(args.archive_dir, exist_ok=True)
+
+    def payload(target):
+        """(library or None, [(path, archive name)]) for one target's release zip."""
+        if web:
+            # Static library payload: nothing to strip (the consumer's
+            # emscripten link drops what it does not use).
+            root = os.path.join("godot", "bin", "web", target)
+            files = [
+                (os.path.join(dirpath, name), os.path.relpath(os.path.join(dirpath, name), root).replace(os.sep, "/"))
+                for dirpath, _, names in os.walk(root)
+                for name in names
+            ]
+            return None, files
+        library = os.path.join("godot", "bin", native_library_name(platform_config, target))
+        return library, [(library, os.path.basename(library))]
+
+    def process(target):
+        started = time.time()
+        library, files = payload(target)
+        if library is None:
+            before = sum(os.path.getsize(path) for path, _ in files)
+            return {"target": target, "files": files, "symbols": [], "links": [], "before": before,
+                    "after": before, "strip_time": 0.0}
+        before = os.path.getsize(library)
+        symbols, links = split_debug_info(platform_config, library, strip=target == "template_release")
+        return {"target": target, "files": files, "symbols": symbols, "links": links, "before": before,
+                "after": os.path.getsize(library), "strip_time": time.time() - started}
+
+    present = []
+    for target in targets:
+        library, files = payload(target)
+        if (library and not os.path.isfile(library)) or not files:
+            console.print(f"[bold yellow]✗ {target}: nothing built - skipped[/bold yellow]")
+            continue
+        present.append(target)
+    if not present:
+        return
+
+    workers = os.cpu_count() or 1
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        with console.status(f"[bold cyan]Stripping and splitting debug info ({len(present)} target(s))"):
+            results = list(pool.map(process, present))
+        for result in results:
+            started = time.time()
+            archive = os.path.join(args.archive_dir, f"libgodot-{rid}-{result['target']}.zip")
+            with console.status(f"[bold cyan]Compressing {os.path.basename(archive)} on {workers} core(s)"):
+                write_archive(archive, result["files"], pool, workers)
+                result["archive"] = os.path.getsize(archive)
+                symbols_archive = os.path.join(args.archive_dir, f"libgodot-{rid}-{result['target']}-symbols.zip")
+                if result["symbols"]:
+                    write_archive(symbols_archive, result["symbols"], pool, workers, result["links"])
+                    result["symbols_archive"] = os.path.getsize(symbols_archive)
+                else:
+                    if os.path.isfile(symbols_archive):
+                        os.remove(symbols_archive)
+                    result["symbols_archive"] = 0
+            result["archive_time"] = time.time() - started
+
+    table = Table(title=f"Natives ({rid}) → {args.archive_dir}", show_header=True, header_style="bold magenta")
+    for column in ["Target", "Built", "Stripped", "Archive", "Symbols", "Strip", "Archive time"]:
+        table.add_column(column, style="cyan" if column == "Target" else "green",
+                         justify="left" if column == "Target" else "right", no_wrap=True)
+    for result in results:
+        table.add_row(
+            result["target"],
+            format_size(result["before"]),
+            format_size(result["after"]) if result["after"] != result["before"] else "-",
+            format_size(result["archive"]),
+            format_size(result["symbols_archive"]) if result["symbols_archive"] else "-",
+            f"{result['strip_time']:.1f}s",
+            f"{result['archive_time']:.1f}s",
+        )
+    console.print(table)
+
+
+# --stage: the natives under their platform package paths in
+# platforms/twodog.<rid>/natives/<variant>/, which Directory.Build.targets
+# packs from (after checking STAGE_MANIFEST) when it exists.
+STAGE_VARIANTS = {"template_release": "release", "template_debug": "debug", "editor": "editor"}
+STAGE_MANIFEST = "manifest.sha256"
+STAGE_SOURCES = ".sources.json"  # source size/mtime per file: skips rehashing unchanged sources
+
+
+def link_or_copy(src: str, dst: str) -> str:
+    """Put src at dst without duplicating its bytes where the filesystem
+    allows: a copy-on-write clone, else a hardlink, else a copy. Returns
+    which one it was."""
+    import shutil
+
+    os.makedirs(os.path.dirname(dst), exist_ok=True)
+    if os.path.lexists(dst):
+        os.remove(dst)
+    if sys.platform == "linux":
+        import fcntl
+
+        FICLONE = 0x40049409
+        with open(src, "rb") as source, open(dst, "wb") as target:
+            try:
+                fcntl.ioctl(target.fileno(), FICLONE, source.fileno())
+                shutil.copystat(src, dst)
+                return "reflink"
+            except OSError:
+                pass
+        os.remove(dst)
+    elif sys.platform == "darwin":
+        import ctypes
+
+        libc = ctypes.CDLL(None, use_errno=True)
+        if libc.clonefile(os.fsencode(src), os.fsencode(dst), 0) == 0:
+            return "reflink"
+    try:
+        # scons and unzip replace outputs rather than rewriting them in
+        # place, so the staged link keeps the staged bytes.
+        os.link(src, dst)
+        return "hardlink"
+    except OSError:
+        shutil.copy2(src, dst)
+        return "copy"
+
+
+def stage_files(platform_config: PlatformConfig, target: str) -> dict:
+    """{path in the package: source path} for one built variant."""
+    rid = PREBUILT_RIDS.get((platform_config.godot_platform, platform_config.godot_arch))
+    if platform_config.godot_platform == Platform.WEB.value:
+        root = os.path.join("godot", "bin", "web", target)
+        return {
+            "godot-web/" + os.path.relpath(os.path.join(dirpath, name), root).replace(os.sep, "/"):
+                os.path.join(dirpath, name)
+            for dirpath, _, names in os.walk(root)
+            for name in names
+        }
+    library = os.path.join("godot", "bin", native_library_name(platform_config, target))
+    if not os.path.isfile(library):
+        return {}
+    extension = platform_config.lib_extension
+    return {f"runtimes/{rid}/native/libgodot-{STAGE_VARIANTS[target]}{extension}": library}
+
+
+def stage_natives(platform_config: PlatformConfig, targets: list[str]):
+    """Link each built variant into its platform package's natives/ layout,
+    skipping files whose content is unchanged, and write the manifest the
+    pack verifies (sha256sum format, paths relative to the variant dir)."""
+    import json
+
+    console.print("\n[bold yellow]┌── Staging natives for packing ──┐[/bold yellow]")
+    rid = PREBUILT_RIDS.get((platform_config.godot_platform, platform_config.godot_arch))
+    if rid is None:
+        console.print(f"[bold yellow]No platform package for {platform_config.godot_platform}/"
+                      f"{platform_config.godot_arch} - nothing to stage[/bold yellow]")
+        return
+
+    for target in targets:
+        started = time.time()
+        files = stage_files(platform_config, target)
+        stage_dir = os.path.join("platforms", f"twodog.{rid}", "natives", STAGE_VARIANTS[target])
+        if not files:
+            console.print(f"[bold yellow]✗ {target}: nothing built - skipped[/bold yellow]")
+            continue
+
+        sources_path = os.path.join(stage_dir, STAGE_SOURCES)
+        previous = {}
+        if os.path.isfile(sources_path):
+            with open(sources_path, encoding="utf-8") as f:
+                previous = json.load(f)
+
+        counts = {"unchanged": 0, "reflink": 0, "hardlink": 0, "copy": 0, "removed": 0}
+        sources = {}
+        for name, source in sorted(files.items()):
+            staged = os.path.join(stage_dir, *name.split("/"))
+            stat = os.stat(source)
+            known = previous.get(name)
+            if known and known[:2] == [stat.st_size, stat.st_mtime_ns] and os.path.isfile(staged):
+                digest = known[2]
+            else:
+                digest = file_sha256(source)
+            staged_unchanged = (
+                known is not None and known[2] == digest
+                and os.path.isfile(staged) and os.path.getsize(staged) == stat.st_size
+            )
+            if staged_unchanged:
+                counts["unchanged"] += 1
+            else:
+                counts[link_or_copy(source, staged)] += 1
+            sources[name] = [stat.st_size, stat.st_mtime_ns, digest]
+
+        # Files a previous payload had but this one does not.
+        for name in set(previous) - set(sources):
+            staged = os.path.join(stage_dir, *name.split("/"))
+            if os.path.isfile(staged):
+                os.remove(staged)
+                counts["removed"] += 1
+
+        with open(os.path.join(stage_dir, STAGE_MANIFEST), "w", encoding="utf-8", newline="\n") as f:
+            for name, (_, _, digest) in sorted(sources.items()):
+                f.write(f"{digest}  {name}\n")
+        with open(sources_path, "w", encoding="utf-8") as f:
+            json.dump(sources, f, indent=1, sort_keys=True)
+
+        summary = ", ".join(f"{count} {kind}" for kind, count in counts.items() if count)
+        console.print(f"[bold green]✓[/bold green] {target} → {stage_dir} ({summary}) "
+                      f"[dim cyan]({time.time() - started:.1f}s)[/dim cyan]")
+
+
+# --affected: every successful step records the godot tree it was built
+# from in BUILD_MANIFEST; the next --affected run diffs the tree against that
+# record and only rebuilds the products the changed paths can reach.
+# Products: "executable" (editor binary), "glue", and the libgodot targets.
+BUILD_MANIFEST = os.path.join("godot", "bin", ".twodog-build.json")
+AFFECTED_TEMPLATES = {"template_release", "template_debug"}
+AFFECTED_EDITOR_SIDE = {"executable", "editor", "glue"}
+AFFECTED_EVERYTHING = AFFECTED_TEMPLATES | AFFECTED_EDITOR_SIDE
+# Files under modules/mono that only the glue step builds (GodotSharp,
+# GodotTools, Godot.NET.Sdk and the source generators are C# projects).
+AFFECTED_MANAGED_EXTENSIONS = {".cs", ".csproj", ".props", ".targets", ".sln", ".slnx", ".json", ".resx"}
+AFFECTED_CORE_DIRS = {"core", "scene", "servers", "drivers", "main", "thirdparty"}
+AFFECTED_IGNORED_DIRS = {"misc", "tests", ".github"}
+AFFECTED_IGNORED_EXTENSIONS = {".md", ".txt", ".yml", ".yaml"}
+
+
+def classify_godot_path(path: str, platform_name: str) -> tuple[str, set[str]]:
+    """(category, products it can affect) for a changed path in the godot tree."""
+    parts = path.split("/")
+    top, name = parts[0], parts[-1]
+    if top in AFFECTED_IGNORED_DIRS or (
+        len(parts) == 1 and (name.startswith(".") or os.path.splitext(name)[1] in AFFECTED_IGNORED_EXTENSIONS)
+    ):
+        return "no build impact", set()
+    if top == "editor" or (top == "platform" and len(parts) > 3 and parts[2] == "export"):
+        # Export plugins of every platform (web included) are editor code.
+        return "editor-only", set(AFFECTED_EDITOR_SIDE)
+    if top == "doc" or (top == "modules" and len(parts) > 3 and parts[2] == "doc_classes"):
+        # The class reference is compiled into the editor and becomes the
+        # C# glue's XML documentation.
+        return "class reference", set(AFFECTED_EDITOR_SIDE)
+    if top == "platform" and len(parts) > 2:
+        if parts[1] == "web":
+            return "web platform", set(AFFECTED_TEMPLATES) if platform_name == Platform.WEB.value else set()
+        if parts[1] != platform_name:
+            return f"other platform ({parts[1]})", set()
+        return "host platform", AFFECTED_EVERYTHING - {"glue"}
+    if top == "modules" and len(parts) > 2:
+        subdir = parts[2] if len(parts) > 3 else ""
+        if parts[1] == "mono":
+            if subdir == "build_scripts" or os.path.splitext(name)[1] in AFFECTED_MANAGED_EXTENSIONS:
+                return "modules/mono glue", {"glue"}
+            if subdir == "editor":
+                # The bindings generator: editor code whose output is the glue.
+                return "editor-only", set(AFFECTED_EDITOR_SIDE)
+            return "modules/mono runtime", set(AFFECTED_EVERYTHING)
+        if subdir == "editor":
+            return "editor-only", set(AFFECTED_EDITOR_SIDE)
+        return "core/scene/servers", set(AFFECTED_EVERYTHING)
+    if top in AFFECTED_CORE_DIRS:
+        return "core/scene/servers", set(AFFECTED_EVERYTHING)
+    # SConstruct, methods.py, version.py, module configs, anything unknown.
+    return "build system", set(AFFECTED_EVERYTHING)
+
+
+def git_godot(*cmd, **kwargs) -> subprocess.CompletedProcess:
+    """git in the godot checkout; a missing git reads as a failed command."""
+    try:
+        return subprocess.run(["git", "-C", "godot", *cmd], capture_output=True, text=True, **kwargs)
+    except FileNotFoundError as e:
+        return subprocess.CompletedProcess(["git", *cmd], 127, "", str(e))
+
+
+def godot_changed_paths(commit: str) -> set[str] | None:
+    """Tracked paths differing from commit plus untracked files (None when
+    commit is unknown, e.g. after a shallow fetch)."""
+    diff = git_godot("diff", "--name-only", "--no-renames", "-z", commit)
+    if diff.returncode != 0:
+        return None
+    # Every new file counts (glue .cs, class reference .xml, ...), not just
+    # what --watch rebuilds on; --exclude-standard already drops build outputs.
+    untracked = git_godot("ls-files", "--others", "--exclude-standard", "-z")
+    paths = set(filter(None, diff.stdout.split("\0")))
+    paths.update(
+        p for p in untracked.stdout.split("\0")
+        if p and ".gen." not in p.rsplit("/", 1)[-1] and not WATCH_SKIP_DIRS.intersection(p.split("/"))
+    )
+    return paths
+
+
+def godot_blob_hashes(paths) -> dict:
+    """path -> git blob hash of the working-tree file ("deleted" when gone)."""
+    paths = sorted(paths)
+    existing = [p for p in paths if os.path.isfile(os.path.join("godot", p))]
+    hashes = dict.fromkeys(paths, "deleted")
+    if existing:
+        out = git_godot("hash-object", "--stdin-paths", input="\n".join(existing) + "\n")
+        hashes.update(zip(existing, out.stdout.split()))
+    return hashes
+
+
+def godot_tree_state() -> dict | None:
+    """The godot checkout as a build sees it: HEAD plus the content hash of
+    every uncommitted change (None when godot/ is not a git checkout or git
+    is not installed)."""
+    head = git_godot("rev-parse", "HEAD")
+    if head.returncode != 0:
+        return None
+    commit = head.stdout.strip()
+    return {"commit": commit, "dirty": godot_blob_hashes(godot_changed_paths(commit) or set())}
+
+
+def changed_since(state: dict) -> set[str] | None:
+    """Paths whose content differs from a recorded tree state."""
+    paths = godot_changed_paths(state["commit"])
+    if paths is None:
+        return None
+    recorded = state["dirty"]
+    # Dirty at build time: changed only if the content moved on since
+    # (including a revert back to the commit).
+    current = godot_blob_hashes(set(recorded))
+    return {p for p in paths if p not in recorded} | {p for p, blob in recorded.items() if current[p] != blob}
+
+
+def build_options(args, product: str) -> dict:
+    """The arguments that shape a product's output; changing them forces a rebuild."""
+    if product == "glue":
+        return {}
+    options = {"dev_build": args.dev_build, "scu_build": args.scu_build}
+    if product != "executable":
+        options.update(debug_symbols=args.debug_symbols, web_profile=args.web_profile)
+    return options
+
+
+def product_output(platform_config: PlatformConfig, product: str) -> str:
+    if product == "executable":
+        return os.path.join("godot", platform_config.godot_exe)
+    if product == "glue":
+        return os.path.join("godot", "bin", "GodotSharp", "Api")
+    if platform_config.godot_platform == Platform.WEB.value:
+        return os.path.join("godot", "bin", "web", product, "libgodot", "libgodot.a")
+    return os.path.join("godot", "bin", native_library_name(platform_config, product))
+
+
+def load_build_manifest() -> dict:
+    import json
+
+    if not os.path.isfile(BUILD_MANIFEST):
+        return {}
+    with open(BUILD_MANIFEST, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def record_build(args, platform_config: PlatformConfig, state: dict | None, products: list[str]):
+    """Note that products were built successfully from the given tree state
+    (args: anything carrying the build_options attributes they were built with)."""
+    import json
+
+    if state is None or not products:
+        return
+    manifest = load_build_manifest()
+    entries = manifest.setdefault(f"{platform_config.godot_platform}.{platform_config.godot_arch}", {})
+    for product in products:
+        entries[product] = {
+            **state,
+            "options": build_options(args, product),
+            "built": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        }
+    os.makedirs(os.path.dirname(BUILD_MANIFEST), exist_ok=True)
+    with open(BUILD_MANIFEST + ".part", "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(BUILD_MANIFEST + ".part", BUILD_MANIFEST)
+
+
+def affected_plan(args, platform_config: PlatformConfig, state: dict | None) -> dict:
+    """--affected: decide which of the requested products the changes since
+    their last successful build reach, and explain why (everything builds
+    when the current tree state is unknown). Returns
+    {"editor": bool, "glue": bool, "targets": [...]}."""
+    console.print("\n[bold yellow]┌── Change impact (--affected) ──┐[/bold yellow]")
+    requested = ([] if args.no_library else libgodot_targets(args, platform_config))
+    requested += [] if args.no_glue else ["glue"]
+    requested += [] if args.no_editor else ["executable"]
+    records = load_build_manifest().get(f"{platform_config.godot_platform}.{platform_config.godot_arch}", {})
+
+    table = Table(show_header=True, header_style="bold magenta")
+    table.add_column("Product", style="cyan", no_wrap=True)
+    table.add_column("Decision", no_wrap=True)
+    table.add_column("Reason")
+    changes_by_commit = {}
+    build = set()
+    for product in requested:
+        label = {"executable": "editor executable", "glue": "mono glue"}.get(product, f"libgodot {product}")
+        record = records.get(product)
+        reason = None
+        if state is None:
+            reason = "godot/ tree state unknown (not a git checkout, or git not installed)"
+        elif record is None:
+            reason = "no successful build recorded"
+        elif not os.path.exists(product_output(platform_config, product)):
+            reason = f"{product_output(platform_config, product)} missing"
+        elif record.get("options") != build_options(args, product):
+            reason = f"build options changed ({record.get('options')} → {build_options(args, product)})"
+        else:
+            key = (record["commit"], tuple(sorted(record["dirty"].items())))
+            if key not in changes_by_commit:
+                changes_by_commit[key] = changed_since(record)
+            changed = changes_by_commit[key]
+            if changed is None:
+                reason = f"recorded commit {record['commit'][:10]} not in the godot checkout"
+            else:
+                hits = {}
+                ignored = {}
+                for path in sorted(changed):
+                    category, products = classify_godot_path(path, platform_config.godot_platform)
+                    bucket = hits if product in products else ignored
+                    bucket.setdefault(category, []).append(path)
+                if hits:
+                    reason = "; ".join(
+                        f"{category}: {len(paths)} file(s) ({', '.join(paths[:2])}{', …' if len(paths) > 2 else ''})"
+                        for category, paths in sorted(hits.items())
+                    )
+                else:
+                    since = f"since {record['commit'][:10]} ({record.get('built', '?')})"
+                    skipped = ", ".join(f"{len(paths)} {category}" for category, paths in sorted(ignored.items()))
+                    table.add_row(label, "[green]skip[/green]",
+                                  f"unaffected by {skipped} {since}" if skipped else f"no changes {since}")
+                    continue
+        build.add(product)
+        table.add_row(label, "[bold yellow]build[/bold yellow]", reason)
+    console.print(table)
+    return {
+        "editor": "executable" in build,
+        "glue": "glue" in build,
+        "targets": [t for t in requested if t in build and t not in ("executable", "glue")],
+    }
+
+
+# Source files whose edits trigger a --watch rebuild. Generated files
+# (*.gen.*) and build outputs are written by scons itself and never count.
+WATCH_EXTENSIONS = {".c", ".cc", ".cpp", ".h", ".hh", ".hpp", ".inc", ".m", ".mm", ".glsl", ".py"}
+WATCH_BUILD_FILES = {"SConstruct", "SCsub"}
+WATCH_SKIP_DIRS = {".git", "bin", "obj", ".scons_cache", "__pycache__", ".godot"}
+WATCH_DEBOUNCE = 0.4  # seconds of quiet that end a burst of saves
+WATCH_POLL_INTERVAL = 1.0
+
+
+def is_watched_source(name: str) -> bool:
+    if ".gen." in name:
+        return False
+    return name in WATCH_BUILD_FILES or os.path.splitext(name)[1] in WATCH_EXTENSIONS
+
+
+class PollingWatcher:
+    """Detects source changes by rescanning file mtimes (portable fallback)."""
+
+    description = "polling"
+
+    def __init__(self, root: str):
+        self.root = root
+        self.snapshot = self.scan()
+
+    def scan(self) -> dict:
+        files = {}
+        for dirpath, dirnames, filenames in os.walk(self.root):
+            dirnames[:] = [d for d in dirnames if d not in WATCH_SKIP_DIRS]
+            for name in filenames:
+                if is_watched_source(name):
+                    path = os.path.join(dirpath, name)
+                    try:
+                        stat = os.stat(path)
+                    except OSError:
+                        continue
+                    files[path] = (stat.st_mtime_ns, stat.st_size)
+        return files
+
+    def poll(self, timeout: float) -> set[str]:
+        """Block up to timeout seconds; return the changed paths."""
+        time.sleep(min(timeout, WATCH_POLL_INTERVAL))
+        snapshot = self.scan()
+        changed = {p for p in snapshot.keys() | self.snapshot.keys() if snapshot.get(p) != self.snapshot.get(p)}
+        self.snapshot = snapshot
+        return changed
+
+
+class InotifyWatcher:
+    """Detects source changes through Linux inotify (one watch per directory)."""
+
+    description = "inotify"
+
+    IN_CLOSE_WRITE = 0x008
+    IN_MOVED_FROM = 0x040
+    IN_MOVED_TO = 0x080
+    IN_CREATE = 0x100
+    IN_DELETE = 0x200
+    IN_Q_OVERFLOW = 0x4000
+    IN_ISDIR = 0x40000000
+    MASK = IN_CLOSE_WRITE | IN_MOVED_FROM | IN_MOVED_TO | IN_CREATE | IN_DELETE
+
+    def __init__(self, root: str):
+        import ctypes
+        import ctypes.util
+
+        self.root = root
+        self.libc = ctypes.CDLL(ctypes.util.find_library("c"), use_errno=True)
+        self.fd = self.libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self.fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1 failed")
+        self.dirs: dict[int, str] = {}
+        self.add_tree(root)
+
+    def add_tree(self, top: str) -> set[str]:
+        """Watch top and its subdirectories; returns the sources already in
+        them (files created in a new directory before its watch existed)."""
+        import ctypes
+
+        found = set()
+        for dirpath, dirnames, filenames in os.walk(top):
+            dirnames[:] = [d for d in dirnames if d not in WATCH_SKIP_DIRS]
+            wd = self.libc.inotify_add_watch(self.fd, os.fsencode(dirpath), self.MASK)
+            if wd < 0:
+                # ENOSPC: fs.inotify.max_user_watches is too low for the tree.
+                raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for {dirpath}")
+            self.dirs[wd] = dirpath
+            found.update(os.path.join(dirpath, name) for name in filenames if is_watched_source(name))
+        return found
+
+    def poll(self, timeout: float) -> set[str]:
+        """Block up to timeout seconds; return the changed paths."""
+        import select
+        import struct
+
+        changed = set()
+        readable, _, _ = select.select([self.fd], [], [], timeout)
+        if not readable:
+            return changed
+        try:
+            data = os.read(self.fd, 256 * 1024)
+        except BlockingIOError:
+            return changed
+        offset = 0
+        while offset + 16 <= len(data):
+            wd, mask, _cookie, length = struct.unpack_from("iIII", data, offset)
+            name = data[offset + 16 : offset + 16 + length].rstrip(b"\0").decode(errors="replace")
+            offset += 16 + length
+            if mask & self.IN_Q_OVERFLOW:
+                changed.add(self.root)  # Events were dropped; rebuild to be safe.
+                continue
+            path = os.path.join(self.dirs.get(wd, self.root), name)
+            if mask & self.IN_ISDIR:
+                if mask & (self.IN_CREATE | self.IN_MOVED_TO) and name not in WATCH_SKIP_DIRS:
+                    changed |= self.add_tree(path)
+            elif is_watched_source(name):
+                changed.add(path)
+        return changed
+
+
+def create_watcher(root: str):
+    """inotify on Linux, mtime polling everywhere else or when inotify is unavailable."""
+    if sys.platform.startswith("linux"):
+        try:
+            return InotifyWatcher(root)
+        except (OSError, AttributeError) as e:
+            console.print(f"[bold yellow]inotify unavailable ({e}); falling back to polling[/bold yellow]")
+    return PollingWatcher(root)
+
+
+def collect_burst(watcher, changes: set[str]) -> set[str]:
+    """Keep collecting changes until the tree has been quiet for WATCH_DEBOUNCE."""
+    while True:
+        more = watcher.poll(WATCH_DEBOUNCE)
+        if not more:
+            return changes
+        changes |= more
+
+
+def interrupt_process(process: subprocess.Popen):
+    """Stop a build started by run_cancellable: scons cleans up partially
+    written targets on SIGINT / CTRL_BREAK, so ask nicely before killing."""
+    import signal
+
+    if process.poll() is not None:
+        return
+    if sys.platform == "win32":
+        process.send_signal(signal.CTRL_BREAK_EVENT)
+    else:
+        os.killpg(process.pid, signal.SIGINT)
+    try:
+        process.wait(timeout=15)
+    except subprocess.TimeoutExpired:
+        if sys.platform == "win32":
+            process.kill()
+        else:
+            os.killpg(process.pid, signal.SIGKILL)
+        process.wait()
+
+
+def run_cancellable(cmd, cwd, description, watcher):
+    """Like run_with_live_output, but keeps watching for source changes while
+    the command runs: a change interrupts it. Returns (status, changes) with
+    status "ok", "failed" or "cancelled"; never exits the process."""
+    import threading
+
+    start_time = time.time()
+    all_output: list[str] = []
+    state = {"last_line": ""}
+    process = subprocess.Popen(
+        cmd,
+        cwd=cwd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.STDOUT,
+        text=True,
+        bufsize=1,
+        universal_newlines=True,
+        # Own process group, so an interrupt reaches scons and its compilers.
+        start_new_session=sys.platform != "win32",
+        creationflags=subprocess.CREATE_NEW_PROCESS_GROUP if sys.platform == "win32" else 0,
+    )
+
+    def pump():
+        for line in iter(process.stdout.readline, ""):
+            line_stripped = line.rstrip()
+            all_output.append(line_stripped)
+            if line_stripped:
+                state["last_line"] = line_stripped
+
+    reader = threading.Thread(target=pump, daemon=True)
+    reader.start()
+    changes: set[str] = set()
+    try:
+        with Live(console=console, refresh_per_second=4) as live:
+            while process.poll() is None:
+                changes |= watcher.poll(0.25)
+                if changes:
+                    interrupt_process(process)
+                    break
+                mins, secs = divmod(int(time.time() - start_time), 60)
+                display = Text()
+                display.append("+ ", style="bold cyan")
+                display.append(f"{description}", style="bold cyan")
+                display.append(f" [{mins:02d}:{secs:02d}]", style="dim cyan")
+                display.append("\n  ")
+                display.append(state["last_line"][:120], style="dim")  # Limit line length
+                live.update(display)
+            live.stop()
+    finally:
+        interrupt_process(process)
+    reader.join()
+
+    mins, secs = divmod(int(time.time() - start_time), 60)
+    if changes:
+        return "cancelled", changes
+    if process.returncode != 0:
+        console.print(
+            f"[bold red]✗ Failed:[/bold red] {description} "
+            f"[dim cyan]({mins:02d}:{secs:02d})[/dim cyan]"
+        )
+        console.print(
+            Panel(
+                rich.markup.escape("\n".join(all_output[-50:])),  # Show last 50 lines
+                title="[bold red]Error Output (last 50 lines)[/bold red]",
+                border_style="red",
+            )
+        )
+        return "failed", changes
+    console.print(f"[bold green]✓[/bold green] {description} [dim cyan]({mins:02d}:{secs:02d})[/dim cyan]")
+    return "ok", changes
+
+
+def watch_libgodot(args, platform_config: PlatformConfig):
+    """--watch: rebuild the selected libgodot target(s) whenever the godot
+    source tree changes; edits arriving mid-build restart the build."""
+    is_web = platform_config.godot_platform == Platform.WEB.value
+    if is_web:
+        check_emscripten_version()
+    targets = libgodot_targets(args, platform_config)
+    watcher = create_watcher("godot")
+    console.print(
+        f"\n[bold yellow]┌── Watching godot/ ({watcher.description}) → "
+        f"{', '.join(targets)} ──┐[/bold yellow]\n[dim]Ctrl+C to stop[/dim]"
+    )
+
+    changes = {"godot"}  # Initial incremental build brings the binaries up to date.
+    first_change = time.time()
+    while True:
+        if not changes:
+            changes = watcher.poll(1.0)
+            first_change = time.time()
+            continue
+        changes = collect_burst(watcher, changes)
+        changes.discard("godot")
+        shown = sorted(os.path.relpath(p, "godot") for p in changes)
+        console.print(
+            f"\n[bold cyan]{len(changes)} change(s):[/bold cyan] "
+            + ", ".join(shown[:5]) + (f" (+{len(shown) - 5} more)" if len(shown) > 5 else "")
+            if changes else "\n[bold cyan]Initial incremental build[/bold cyan]"
+        )
+
+        build_start = time.time()
+        status, changes = "ok", set()
+        for target in targets:
+            if is_web:
+                clear_web_zip_staging()
+            cmd, task_desc = libgodot_command(args, platform_config, target)
+            status, changes = run_cancellable(cmd, "godot", task_desc, watcher)
+            if status != "ok":
+                break
+            if is_web:
+                stage_web_payload(target, args.web_profile)
+
+        now = time.time()
+        if status == "ok":
+            console.print(
+                f"[bold green]✓ Rebuilt in {now - build_start:.1f}s[/bold green] "
+                f"[dim](edit → binary {now - first_change:.1f}s)[/dim]"
+            )
+        elif status == "cancelled":
+            console.print(
+                f"[bold yellow]↻ New changes after {now - build_start:.1f}s - restarting build[/bold yellow]"
+            )
+            first_change = now
+        else:
+            console.print("[bold red]Waiting for the next change…[/bold red]")
+
+
 def main():
     args = parse_arguments()
     # Resolve cache path to absolute so it works regardless of scons cwd
@@ -560,6 +1982,10 @@ def main():
         arch_override=args.arch,
     )
 
+    if args.watch:
+        args.no_editor = True
+        args.no_glue = True
+
     show_build_config(args, platform_config)
 
     console.print(
@@ -576,14 +2002,54 @@ def main():
         args.no_editor = True
         args.no_glue = True
 
+    if args.watch:
+        watch_libgodot(args, platform_config)
+        return
+
+    # Taken before anything builds: edits made during the build count as
+    # changes for the next --affected run. Only needed once --affected is in
+    # use (it spawns git and hashes every dirty file).
+    tree_state = None
+    if args.affected or os.path.isfile(BUILD_MANIFEST):
+        tree_state = godot_tree_state()
+
+    targets = None
+    if args.affected:
+        plan = affected_plan(args, platform_config, tree_state)
+        args.no_editor = not plan["editor"]
+        args.no_glue = not plan["glue"]
+        targets = plan["targets"]
+        args.no_library = args.no_library or not targets
+
+    if args.fetch_prebuilt:
+        wanted_glue = not args.no_glue
+        wanted_targets = [] if args.no_library else targets or libgodot_targets(args, platform_config)
+        remaining = fetch_prebuilt(args, platform_config, wanted_targets)
+        args.no_editor = not remaining["editor"]
+        args.no_glue = not remaining["glue"]
+        targets = remaining["targets"]
+        args.no_library = args.no_library or not targets
+        fetched = [t for t in wanted_targets if t not in targets]
+        record_build(argparse.Namespace(**PREBUILT_BUILD_OPTIONS), platform_config, tree_state,
+                     fetched + (["glue"] if wanted_glue and args.no_glue else []))
+
     if not args.no_editor:
         build_editor(args, platform_config)
+        record_build(args, platform_config, tree_state, ["executable"])
 
     if not args.no_glue:
         generate_glue(platform_config)
+        record_build(args, platform_config, tree_state, ["glue"])
 
     if not args.no_library:
-        build_libgodot(args, platform_config)
+        build_libgodot(args, platform_config, targets)
+        record_build(args, platform_config, tree_state, targets or libgodot_targets(args, platform_config))
+
+    if args.post_process:
+        post_process_natives(args, platform_config, libgodot_targets(args, platform_config))
+
+    if args.stage:
+        stage_natives(platform_config, libgodot_targets(args, platform_config))
 
     # Final success message
     console.print()
@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""Pack the managed twodog packages (engine, avalonia, xunit, tool) in
+dependency order, running independent packs concurrently and skipping packs
+whose inputs and package are unchanged since the last run, then restore."""
+
+import argparse
+import hashlib
+import importlib.util
+import os
+import re
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# build-godot.py is not an importable module name; load it for its console and
+# live-output runners.
+_spec = importlib.util.spec_from_file_location("build_godot", os.path.join(ROOT, "build-godot.py"))
+build_godot = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(build_godot)
+
+from rich.panel import Panel  # noqa: E402
+
+console = build_godot.console
+
+PROJECTS = ["twodog.engine", "twodog.avalonia", "twodog.xunit", "twodog"]
+
+# Inputs a project reads through MSBuild properties rather than relative
+# Include paths (see twodog.engine.csproj: GodotSharp, source generators,
+# GodotPlugins - all from the fork build).
+EXTRA_INPUTS = {
+    "twodog.engine": [
+        "godot/bin/GodotSharp/Api",
+        "godot/modules/mono/editor/Godot.NET.Sdk/Godot.SourceGenerators/bin/Release",
+    ],
+}
+
+# Evaluated by every project.
+SHARED_INPUTS = ["Directory.Build.props", "Directory.Build.targets", "global.json", "nuget.config"]
+
+SKIPPED_DIRS = {"bin", "obj", ".godot", ".vs", ".idea"}
+
+STAMP_NAME = "twodog-pack.stamp"
+
+
+def parse_arguments():
+    """Parse command-line arguments."""
+    parser = argparse.ArgumentParser(
+        description="2dog managed package build (dotnet pack orchestration)",
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter,
+    )
+    parser.add_argument(
+        "--force",
+        action="store_true",
+        help="Pack every project even if its inputs are unchanged",
+    )
+    parser.add_argument(
+        "--sequential",
+        action="store_true",
+        help="Run one dotnet pack at a time",
+    )
+    parser.add_argument(
+        "--no-restore",
+        action="store_true",
+        help="Skip the final dotnet restore",
+    )
+    return parser.parse_args()
+
+
+def read_props() -> dict:
+    """Literal and $(Property)-composed properties from the root Directory.Build.props."""
+    with open(os.path.join(ROOT, "Directory.Build.props"), encoding="utf-8") as f:
+        text = f.read()
+    props = {}
+    for name, value in re.findall(r"<(\w+)>([^<]*)</\1>", text):
+        props.setdefault(name, value)
+    return props
+
+
+def expand(value: str, props: dict) -> str:
+    return re.sub(r"\$\((\w+)\)", lambda m: expand(props.get(m.group(1), ""), props), value)
+
+
+def normalize_version(version: str) -> str:
+    """NuGet drops a trailing .0 fourth segment (4.7.0.0 -> 4.7.0)."""
+    return re.sub(r"^(\d+\.\d+\.\d+)\.0$", r"\1", version)
+
+
+class Project:
+    """One packable project: its csproj facts and pack inputs."""
+
+    def __init__(self, name: str, props: dict):
+        self.name = name
+        self.dir = os.path.join(ROOT, name)
+        with open(os.path.join(self.dir, f"{name}.csproj"), encoding="utf-8") as f:
+            self.csproj = f.read()
+        self.package_id = re.search(r"<PackageId>([^<]+)</PackageId>", self.csproj).group(1)
+        version = re.search(r"<Version>([^<]+)</Version>", self.csproj).group(1)
+        self.version = normalize_version(expand(version, props))
+        self.references = [
+            os.path.basename(os.path.dirname(os.path.normpath(os.path.join(self.dir, p.replace("\\", "/")))))
+            for p in re.findall(r'<ProjectReference\s+Include="([^"]+)"', self.csproj)
+        ]
+        self.stamp = os.path.join(self.dir, "obj", STAMP_NAME)
+
+    @property
+    def package(self) -> str:
+        return os.path.join(ROOT, "packages", f"{self.package_id}.{self.version}.nupkg")
+
+    def input_dirs(self) -> list[str]:
+        """The project directory plus every sibling directory its csproj
+        includes from (../twodog.import, ../templates/twodog, ...)."""
+        dirs = {self.dir}
+        for path in re.findall(r'(?:Include|Projects)="\.\.[\\/]([^"$*;]+)', self.csproj):
+            parts = path.replace("\\", "/").split("/")
+            if SKIPPED_DIRS.intersection(parts):  # another project's build output
+                continue
+            # Keep the directory part (up to two levels) of the included path.
+            dirs.add(os.path.join(ROOT, *parts[: min(2, len(parts) - 1) or 1]))
+        dirs.update(os.path.join(ROOT, extra) for extra in EXTRA_INPUTS.get(self.name, []))
+        return sorted(dirs)
+
+    def fingerprint(self, dependencies: list[str]) -> str:
+        """Hash of the size and mtime of every input file, plus the
+        dependencies' fingerprints and the package version."""
+        digest = hashlib.sha256(f"{self.package_id} {self.version}\n".encode())
+        for dependency in dependencies:
+            digest.update(f"dep {dependency}\n".encode())
+        files = [os.path.join(ROOT, f) for f in SHARED_INPUTS]
+        for top in self.input_dirs():
+            if os.path.isfile(top):
+                files.append(top)
+                continue
+            for dirpath, dirnames, filenames in os.walk(top):
+                dirnames[:] = sorted(d for d in dirnames if d not in SKIPPED_DIRS)
+                files.extend(os.path.join(dirpath, f) for f in filenames)
+        for path in sorted(files):
+            if os.path.isfile(path):
+                stat = os.stat(path)
+                digest.update(f"{os.path.relpath(path, ROOT)} {stat.st_size} {stat.st_mtime_ns}\n".encode())
+        return digest.hexdigest()
+
+    def up_to_date(self, fingerprint: str) -> bool:
+        """Unchanged inputs, the package still in packages/, and build output to
+        reference (dependents pack with BuildProjectReferences=false)."""
+        if not (os.path.isfile(self.stamp) and os.path.isfile(self.package)):
+            return False
+        if not os.path.isdir(os.path.join(self.dir, "bin", "Release")):
+            return False
+        with open(self.stamp, encoding="utf-8") as f:
+            recorded, package_mtime = (f.read().split() + ["", ""])[:2]
+        return recorded == fingerprint and package_mtime == str(os.stat(self.package).st_mtime_ns)
+
+    def record(self, fingerprint: str) -> None:
+        os.makedirs(os.path.dirname(self.stamp), exist_ok=True)
+        with open(self.stamp, "w", encoding="utf-8") as f:
+            f.write(f"{fingerprint} {os.stat(self.package).st_mtime_ns}\n")
+
+
+def dependency_waves(projects: dict) -> list[list[str]]:
+    """Group projects into waves: each wave only depends on earlier waves."""
+    remaining = {name: {r for r in project.references if r in projects}
+                 for name, project in projects.items()}
+    waves = []
+    while remaining:
+        ready = sorted(name for name, deps in remaining.items() if not deps)
+        if not ready:
+            console.print(f"[bold red]Project reference cycle among: {', '.join(remaining)}[/bold red]")
+            sys.exit(1)
+        waves.append(ready)
+        for name in ready:
+            del remaining[name]
+        for deps in remaining.values():
+            deps.difference_update(ready)
+    return waves
+
+
+def pack_command(project: Project) -> list[str]:
+    cmd = [
+        "dotnet",
+        "pack",
+        project.name,
+        # Keep MSBuild worker nodes and the Roslyn compiler server alive
+        # between (and shared by) the concurrent packs.
+        "-nodeReuse:true",
+        "-p:UseSharedCompilation=true",
+    ]
+    if project.references:
+        # Referenced projects were packed (and therefore built) in an earlier
+        # wave; building them again from concurrent packs would race on their
+        # obj/bin directories.
+        cmd.append("-p:BuildProjectReferences=false")
+    return cmd
+
+
+def main():
+    args = parse_arguments()
+    os.chdir(ROOT)
+    # The MSBuild server keeps evaluation caches warm across dotnet invocations.
+    os.environ.setdefault("DOTNET_CLI_USE_MSBUILD_SERVER", "1")
+
+    props = read_props()
+    projects = {name: Project(name, props) for name in PROJECTS}
+    waves = dependency_waves(projects)
+    console.print(
+        "[bold cyan]Pack order:[/bold cyan] "
+        + " → ".join("{" + ", ".join(wave) + "}" for wave in waves)
+    )
+
+    fingerprints = {}
+    packed = []
+    for wave in waves:
+        jobs = []
+        for name in wave:
+            project = projects[name]
+            fingerprint = project.fingerprint([fingerprints[r] for r in project.references if r in fingerprints])
+            fingerprints[name] = fingerprint
+            if not args.force and project.up_to_date(fingerprint):
+                console.print(f"[dim]✓ {project.package_id} {project.version} unchanged - skipping pack[/dim]")
+                continue
+            jobs.append(project)
+        if not jobs:
+            continue
+        commands = [(pack_command(p), None, f"dotnet pack {p.name} ({p.package_id} {p.version})") for p in jobs]
+        if args.sequential or len(commands) == 1:
+            for cmd, cwd, description in commands:
+                build_godot.run_with_live_output(cmd, cwd=cwd, description=description)
+        else:
+            build_godot.run_parallel_with_live_output(commands)
+        for project in jobs:
+            project.record(fingerprints[project.name])
+            packed.append(project.name)
+
+    if args.no_restore:
+        pass
+    elif packed or not os.path.isdir(os.path.join(ROOT, ".packages")):
+        build_godot.run_with_live_output(["dotnet", "restore"], description="dotnet restore")
+    else:
+        console.print("[dim]✓ No package changed - skipping dotnet restore[/dim]")
+
+    total_elapsed = time.time() - build_godot.global_start_time
+    mins, secs = divmod(int(total_elapsed), 60)
+    console.print(
+        Panel.fit(
+            f"[bold green]✓ Managed packages: {len(packed)} packed, "
+            f"{len(PROJECTS) - len(packed)} unchanged ({mins:02d}min, {secs:02d}sec)",
+            border_style="green",
+        )
+    )
+
+
+if __name__ == "__main__":
+    try:
+        main()
+    except KeyboardInterrupt:
+        console.print("\n[bold red]Build cancelled by user[/bold red]")
+        sys.exit(1)
+    except Exception as e:  # noqa: F841
+        console.print("\n[bold red]Build failed with error:[/bold red]")
+        import traceback
+
+        console.print(traceback.format_exc(), markup=False)
+        sys.exit(1)
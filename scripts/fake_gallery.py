@@ -0,0 +1,380 @@
+#!/usr/bin/env python3
+"""Local stand-in for the nuget.org endpoints scripts/nuget_retire.py talks to.
+
+Serves a synthetic 2dog package set from memory so nuget_retire.py can be
+measured and exercised offline (point it here with --source):
+
+  GET    /autocomplete?q=PREFIX                   search autocomplete
+  GET    /v3-flatcontainer/{id}/index.json        every published version
+  GET    /v3/registration5-gz-semver2/{id}/...    gzip registration index,
+                                                  paged like nuget.org (pages
+                                                  of 64, external past 128)
+  GET    /v3/catalog0/index.json, page{n}.json,   catalog of every change
+         data/{n}.json                            made through this server
+  DELETE /api/v2/package/{id}/{version}           unlist; 429 + Retry-After
+                                                  past --unlist-limit per
+                                                  --unlist-window seconds
+  GET    /packages/{id}/{version}/Manage          antiforgery token page
+  POST   /json/deprecation/deprecate              deprecate versions
+
+Requests without the expected Cookie header are redirected to the sign-in
+page, like an expired session. The two website endpoints (Manage and the
+deprecation POST) share their own limit: past --deprecate-limit requests per
+--deprecate-window seconds they answer 429 with an HTTP-date Retry-After,
+and --fail-every N answers every Nth of them with a 503, so retries and
+back-off can be exercised. Every request is counted (with bytes in and out,
+429s and 5xx answers) so scripts/nuget_retire_bench.py can report what a run
+cost.
+
+Usage:
+  uv run scripts/fake_gallery.py --packages 12 --versions 300
+  uv run scripts/nuget_retire.py --source http://127.0.0.1:8089
+"""
+
+from __future__ import annotations
+
+import argparse
+import email.utils
+import gzip
+import math
+import json
+import threading
+import time
+import urllib.parse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+COOKIE = "session=fake-gallery"
+TOKEN = "fake-antiforgery-token"
+CATALOG_PAGE_SIZE = 550
+REGISTRATION_PAGE_SIZE = 64
+REGISTRATION_INLINE_LIMIT = 128
+
+
+# Ids nuget_retire.py always looks up (the main package and its DEAD_PACKAGES).
+FIXED_IDS = ["2dog", "2dog.osx-x64", "2dog.cli", "2dog.Templates"]
+
+
+def synthetic_packages(count: int, versions: int) -> dict[str, list[str]]:
+    """FIXED_IDS plus 2dog.synthetic-N ids up to `count` packages in total,
+    `versions` versions each, every tenth one a prerelease."""
+    ids = FIXED_IDS + [f"2dog.synthetic-{n}" for n in range(max(0, count - len(FIXED_IDS)))]
+    return {package_id: [f"4.{n // 100}.{n % 100}" + (f"-beta.{n}" if n % 10 == 9 else "")
+                         for n in range(versions)]
+            for package_id in ids}
+
+
+# Age of the catalog commits for the initial package set: published well
+# before any client starts following the catalog.
+INITIAL_COMMIT_AGE = 86400.0
+
+
+def catalog_stamp(serial: int, age: float = 0.0) -> str:
+    """Monotonic catalog commit timestamps with the catalog's 7 fractional digits."""
+    return time.strftime("%Y-%m-%dT%H:%M:%S", time.gmtime(time.time() - age)) + f".{serial:07d}Z"
+
+
+class FakeGallery:
+    """In-memory gallery state plus the HTTP server that exposes it."""
+
+    def __init__(self, packages: dict[str, list[str]], port: int = 0,
+                 unlist_limit: int = 250, unlist_window: float = 3600.0,
+                 deprecate_limit: int = 0, deprecate_window: float = 60.0, fail_every: int = 0):
+        self.lock = threading.RLock()
+        self.packages = {package_id: {v.lower(): {"listed": True, "deprecated": False}
+                                      for v in versions}
+                         for package_id, versions in packages.items()}
+        self.unlist_limit, self.unlist_window = unlist_limit, unlist_window
+        self.unlist_times: list[float] = []
+        # deprecate_limit 0: the website endpoints are never rate-limited.
+        self.deprecate_limit, self.deprecate_window = deprecate_limit, deprecate_window
+        self.deprecate_times: list[float] = []
+        self.fail_every, self.website_requests = fail_every, 0
+        self.catalog: list[dict] = []
+        for package_id, versions in self.packages.items():
+            for version in versions:
+                self.commit(package_id, version, INITIAL_COMMIT_AGE)
+        self.reset_stats()
+
+        handler = type("Handler", (RequestHandler,), {"gallery": self})
+        self.server = ThreadingHTTPServer(("127.0.0.1", port), handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+
+    def reset_stats(self) -> None:
+        with self.lock:
+            self.stats = {"requests": 0, "bytes_in": 0, "bytes_out": 0, "rate_limited": 0,
+                          "server_errors": 0}
+
+    def count(self, status: int, bytes_in: int, bytes_out: int) -> None:
+        with self.lock:
+            self.stats["requests"] += 1
+            self.stats["bytes_in"] += bytes_in
+            self.stats["bytes_out"] += bytes_out
+            self.stats["rate_limited"] += status == 429
+            self.stats["server_errors"] += status >= 500
+
+    def commit(self, package_id: str, version: str, age: float = 0.0) -> None:
+        state = self.packages[package_id][version]
+        self.catalog.append({"id": package_id, "version": version, **state,
+                             "stamp": catalog_stamp(len(self.catalog) + 1, age)})
+
+    def publish(self, package_id: str, version: str) -> None:
+        """A new listed version, committed to the catalog like a push."""
+        with self.lock:
+            self.packages[package_id][version.lower()] = {"listed": True, "deprecated": False}
+            self.commit(package_id, version.lower())
+
+    def start(self) -> FakeGallery:
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        self.server.shutdown()
+        self.server.server_close()
+
+    def __enter__(self) -> FakeGallery:
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    def lookup(self, package_id: str) -> str | None:
+        return next((p for p in self.packages if p.lower() == package_id.lower()), None)
+
+    @staticmethod
+    def window_allowed(times: list[float], limit: int, window: float) -> float:
+        """0 when a request may proceed (and is recorded in times), else the
+        seconds until the sliding window frees up."""
+        now = time.monotonic()
+        times[:] = [t for t in times if now - t < window]
+        if len(times) >= limit:
+            return window - (now - times[0])
+        times.append(now)
+        return 0.0
+
+    def unlist_allowed(self) -> float:
+        """0 when an unlist may proceed, else the seconds until the window frees up."""
+        return self.window_allowed(self.unlist_times, self.unlist_limit, self.unlist_window)
+
+    def website_answer(self) -> tuple[int, float]:
+        """(status, Retry-After seconds) for a Manage page or deprecation POST:
+        200 to proceed, an injected 503, or 429 past the deprecate limit."""
+        self.website_requests += 1
+        if self.fail_every and self.website_requests % self.fail_every == 0:
+            return 503, 0.0
+        if self.deprecate_limit:
+            wait = self.window_allowed(self.deprecate_times, self.deprecate_limit, self.deprecate_window)
+            if wait:
+                return 429, wait
+        return 200, 0.0
+
+    def registration(self, package_id: str) -> tuple[dict, list[list[dict]]]:
+        base = f"{self.url}/v3/registration5-gz-semver2/{package_id.lower()}"
+        leaves = [{"catalogEntry": {"id": package_id, "version": version, "listed": state["listed"],
+                                    **({"deprecation": {"reasons": ["Legacy"]}}
+                                       if state["deprecated"] else {})}}
+                  for version, state in self.packages[package_id].items()]
+        pages = [leaves[i:i + REGISTRATION_PAGE_SIZE]
+                 for i in range(0, len(leaves), REGISTRATION_PAGE_SIZE)]
+        inline = len(leaves) <= REGISTRATION_INLINE_LIMIT
+        index = {"count": len(pages), "items": [
+            {"@id": f"{base}/page/{n}.json", "count": len(page),
+             **({"items": page} if inline else {})}
+            for n, page in enumerate(pages)]}
+        return index, pages
+
+
+class RequestHandler(BaseHTTPRequestHandler):
+    gallery: FakeGallery
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args) -> None:
+        pass
+
+    def reply(self, status: int, body: bytes | str | dict, headers: dict | None = None,
+              gzipped: bool = False) -> None:
+        if isinstance(body, dict):
+            body = json.dumps(body)
+        if isinstance(body, str):
+            body = body.encode()
+        if gzipped:
+            body = gzip.compress(body)
+        self.send_response(status)
+        for key, value in {**(headers or {}),
+                           **({"Content-Encoding": "gzip"} if gzipped else {})}.items():
+            self.send_header(key, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        self.gallery.count(status, self.body_size, len(body))
+
+    def read_body(self) -> bytes:
+        self.body_size = int(self.headers.get("Content-Length") or 0)
+        return self.rfile.read(self.body_size)
+
+    def website_throttled(self) -> bool:
+        """Answer 429/503 per FakeGallery.website_answer; True when it did."""
+        status, wait = self.gallery.website_answer()
+        if status == 429:
+            # The website (unlike the v2 API) sends an HTTP-date.
+            until = email.utils.formatdate(math.ceil(time.time() + wait), usegmt=True)
+            self.reply(429, "rate limited", {"Retry-After": until})
+        elif status != 200:
+            self.reply(status, "service unavailable")
+        return status != 200
+
+    def signed_in(self) -> bool:
+        if self.headers.get("Cookie") == COOKIE:
+            return True
+        self.reply(302, "", {"Location": "/users/account/LogOn?returnUrl=" +
+                             urllib.parse.quote(self.path)})
+        return False
+
+    def do_GET(self) -> None:
+        self.read_body()
+        url = urllib.parse.urlsplit(self.path)
+        parts = url.path.strip("/").split("/")
+        gallery = self.gallery
+        with gallery.lock:
+            if parts == ["autocomplete"]:
+                prefix = urllib.parse.parse_qs(url.query).get("q", [""])[0].lower()
+                data = [p for p, versions in gallery.packages.items()
+                        if p.lower().startswith(prefix)
+                        and any(s["listed"] for s in versions.values())]
+                return self.reply(200, {"totalHits": len(data), "data": data})
+            if parts[0] == "v3-flatcontainer" and parts[-1] == "index.json":
+                package_id = gallery.lookup(parts[1])
+                if package_id:
+                    return self.reply(200, {"versions": list(gallery.packages[package_id])})
+            if parts[:2] == ["v3", "registration5-gz-semver2"]:
+                package_id = gallery.lookup(parts[2])
+                if package_id:
+                    index, pages = gallery.registration(package_id)
+                    if parts[3:] == ["index.json"]:
+                        return self.reply(200, index, gzipped=True)
+                    if parts[3] == "page" and parts[4].removesuffix(".json").isdigit():
+                        n = int(parts[4].removesuffix(".json"))
+                        if n < len(pages):
+                            return self.reply(200, {"items": pages[n]}, gzipped=True)
+            if parts[:2] == ["v3", "catalog0"]:
+                return self.catalog(parts[2:])
+            if parts[:1] == ["users"]:
+                return self.reply(200, '<form action="/users/account/LogOn" method="post">'
+                                       '<input name="__RequestVerificationToken" value="x"/></form>')
+            if parts[0] == "packages" and parts[-1] == "Manage":
+                if self.website_throttled() or not self.signed_in():
+                    return
+                return self.reply(200, '<a href="/users/account/LogOff">Sign out</a><form>'
+                                       '<input name="__RequestVerificationToken" type="hidden" '
+                                       f'value="{TOKEN}" /></form>')
+        self.reply(404, "not found")
+
+    def catalog(self, parts: list[str]) -> None:
+        gallery = self.gallery
+        pages = [gallery.catalog[i:i + CATALOG_PAGE_SIZE]
+                 for i in range(0, len(gallery.catalog), CATALOG_PAGE_SIZE)]
+        base = f"{gallery.url}/v3/catalog0"
+        if not parts:
+            return self.reply(404, "not found")
+        if parts == ["index.json"]:
+            # nuget.org's catalog head is always recent: other packages'
+            # commits move it even when none of these change.
+            return self.reply(200, {
+                "commitTimeStamp": catalog_stamp(len(gallery.catalog)),
+                "items": [{"@id": f"{base}/page{n}.json", "commitTimeStamp": page[-1]["stamp"],
+                           "count": len(page)} for n, page in enumerate(pages)]})
+        name = parts[-1].removesuffix(".json")
+        if parts[0].startswith("page") and parts[0][4:-5].isdigit():
+            n = int(parts[0][4:-5])
+            if n < len(pages):
+                return self.reply(200, {"items": [
+                    {"@id": f"{base}/data/{n * CATALOG_PAGE_SIZE + i}.json",
+                     "@type": "nuget:PackageDetails", "commitTimeStamp": item["stamp"],
+                     "nuget:id": item["id"], "nuget:version": item["version"]}
+                    for i, item in enumerate(pages[n])]})
+        if parts[0] == "data" and name.isdigit() and int(name) < len(gallery.catalog):
+            item = gallery.catalog[int(name)]
+            return self.reply(200, {"id": item["id"], "version": item["version"],
+                                    "listed": item["listed"],
+                                    **({"deprecation": {"reasons": ["Legacy"]}}
+                                       if item["deprecated"] else {})})
+        self.reply(404, "not found")
+
+    def do_DELETE(self) -> None:
+        self.read_body()
+        parts = urllib.parse.urlsplit(self.path).path.strip("/").split("/")
+        gallery = self.gallery
+        with gallery.lock:
+            if parts[:3] != ["api", "v2", "package"] or len(parts) != 5:
+                return self.reply(404, "not found")
+            if not self.headers.get("X-NuGet-ApiKey"):
+                return self.reply(403, "missing API key")
+            package_id = gallery.lookup(parts[3])
+            version = parts[4].lower()
+            if not package_id or version not in gallery.packages[package_id]:
+                return self.reply(404, "not found")
+            wait = gallery.unlist_allowed()
+            if wait:
+                return self.reply(429, "rate limited", {"Retry-After": str(max(1, round(wait)))})
+            gallery.packages[package_id][version]["listed"] = False
+            gallery.commit(package_id, version)
+        self.reply(200, "")
+
+    def do_POST(self) -> None:
+        body = self.read_body()
+        gallery = self.gallery
+        if urllib.parse.urlsplit(self.path).path != "/json/deprecation/deprecate":
+            return self.reply(404, "not found")
+        with gallery.lock:
+            if self.website_throttled():
+                return
+        if not self.signed_in():
+            return
+        fields = urllib.parse.parse_qs(body.decode())
+        if fields.get("__RequestVerificationToken") != [TOKEN]:
+            return self.reply(400, "antiforgery token mismatch")
+        with gallery.lock:
+            package_id = gallery.lookup(fields.get("id", [""])[0])
+            if not package_id:
+                return self.reply(404, "not found")
+            for version in fields.get("versions", []):
+                version = version.lower()
+                if version in gallery.packages[package_id]:
+                    gallery.packages[package_id][version]["deprecated"] = True
+                    gallery.commit(package_id, version)
+        self.reply(200, {"success": True})
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--packages", type=int, default=12, help="number of package ids, at least the 4 real ones (default 12)")
+    parser.add_argument("--versions", type=int, default=300, help="versions per package (default 300)")
+    parser.add_argument("--unlist-limit", type=int, default=250,
+                        help="unlists allowed per window before 429 (default 250)")
+    parser.add_argument("--unlist-window", type=float, default=3600.0,
+                        help="unlist rate-limit window in seconds (default 3600)")
+    parser.add_argument("--deprecate-limit", type=int, default=0,
+                        help="Manage pages + deprecation POSTs allowed per window before 429 "
+                             "(default 0: unlimited)")
+    parser.add_argument("--deprecate-window", type=float, default=60.0,
+                        help="deprecation rate-limit window in seconds (default 60)")
+    parser.add_argument("--fail-every", type=int, default=0, metavar="N",
+                        help="answer every Nth Manage page / deprecation POST with 503 "
+                             "(default 0: never)")
+    args = parser.parse_args()
+
+    gallery = FakeGallery(synthetic_packages(args.packages, args.versions), args.port,
+                          args.unlist_limit, args.unlist_window,
+                          args.deprecate_limit, args.deprecate_window, args.fail_every)
+    print(f"Fake gallery on {gallery.url} - deprecation cookie: {COOKIE!r}")
+    try:
+        gallery.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    print(f"\n{gallery.stats}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -17,7 +17,9 @@ only touch what still needs retiring:
              250/hour per key - the script sleeps and retries on 429, so a
              large run may take over an hour.
   deprecate  POST /json/deprecation/deprecate per package (all retired
-             versions in one call). UNOFFICIAL: this is the endpoint the
+             versions in one call; --jobs packages in flight, paced and
+             retried on 429/5xx, aborting as soon as the cookie has
+             expired). UNOFFICIAL: this is the endpoint the
              nuget.org website itself uses (no public API exists, see
              NuGet/NuGetGallery#8873); it needs a logged-in browser
              session's Cookie header and may break without notice. The
@@ -30,6 +32,14 @@ Usage:
   uv run poe nuget-retire --packages "2dog.gdextension.*"     # wildcards ok
   uv run poe nuget-retire deprecate --packages 2dog.osx-x64   # smoke test
   uv run poe nuget-retire deprecate             # NUGET_COOKIE env var
+  uv run poe nuget-retire --index retire.sqlite # plan from a local index
+
+--index keeps a local SQLite copy of every tracked package's versions and
+their listed/deprecated flags. The first run seeds it from the registration
+index; later runs only download the NuGet catalog pages committed since the
+saved cursor, so planning no longer re-queries every package. --source points
+every endpoint at one base URL: scripts/fake_gallery.py is such a stand-in,
+and `uv run poe nuget-retire-bench` measures every action against it offline.
 
 The unlist key must be a classic nuget.org API key with the "Unlist package"
 scope on 2dog* - Trusted Publishing OIDC keys are push-only. The deprecation
@@ -40,18 +50,25 @@ devtools on a logged-in nuget.org page.
 from __future__ import annotations
 
 import argparse
+import datetime
+import email.utils
 import fnmatch
 import gzip
 import json
 import os
 import re
+import sqlite3
 import sys
+import threading
 import time
 import urllib.error
 import urllib.parse
 import urllib.request
+from concurrent.futures import FIRST_COMPLETED, CancelledError, Future, ThreadPoolExecutor, wait
 
 GALLERY = "https://www.nuget.org"
+API = "https://api.nuget.org"
+SEARCH = "https://azuresearch-usnc.nuget.org"
 
 # --packages entries may be fnmatch wildcards (* ? [..]). They expand against
 # nuget.org's autocomplete index, which only knows packages with at least one
@@ -76,20 +93,30 @@ DEAD_PACKAGES = {
 # the default urllib user agent.
 USER_AGENT = "2dog-nuget-retire/1.0 (+https://github.com/outfox/2dog)"
 
+# Pause between unlist DELETEs (the 429 handling covers the hourly limit).
+UNLIST_INTERVAL = 0.5
+
+# How far before the catalog's head a new --index starts following it. The
+# registration index used for seeding lags the catalog; commits in that gap
+# are replayed instead of lost (replaying a commit again is harmless).
+CATALOG_SEED_MARGIN = datetime.timedelta(hours=3)
+
 
-def http(method: str, url: str, headers: dict | None = None, body: bytes | None = None):
-    """Returns (status, headers, text) without raising on HTTP errors."""
+def http(method: str, url: str, headers: dict | None = None, body: bytes | None = None,
+         binary: bool = False):
+    """Returns (status, headers, text) without raising on HTTP errors; with
+    binary=True the body is returned as bytes."""
     request = urllib.request.Request(
         url, method=method, data=body,
         headers={"User-Agent": USER_AGENT, **(headers or {})})
 
-    def decode(response) -> str:
+    def decode(response) -> str | bytes:
         raw = response.read()
         # The registration blobs are stored gzipped and served with
         # Content-Encoding: gzip whether or not the client asked for it.
         if response.headers.get("Content-Encoding") == "gzip":
             raw = gzip.decompress(raw)
-        return raw.decode("utf-8", "replace")
+        return raw if binary else raw.decode("utf-8", "replace")
 
     try:
         with urllib.request.urlopen(request) as response:
@@ -98,6 +125,21 @@ def http(method: str, url: str, headers: dict | None = None, body: bytes | None
         return error.code, dict(error.headers), decode(error)
 
 
+def retry_after(headers: dict, default: float) -> float:
+    """Seconds to wait per a Retry-After header: delay-seconds or an HTTP-date
+    (RFC 9110), default when absent or unparseable."""
+    value = (headers.get("Retry-After") or "").strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        when = email.utils.parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return default
+    if when.tzinfo is None:  # "-0000": UTC per RFC 5322
+        when = when.replace(tzinfo=datetime.timezone.utc)
+    return max(0.0, (when - datetime.datetime.now(datetime.timezone.utc)).total_seconds())
+
+
 def version_sort_key(version: str):
     """NuGet-ish ordering: numeric part, then stable > prerelease."""
     numeric, _, prerelease = version.partition("-")
@@ -115,7 +157,7 @@ def expand_packages(patterns: list[str]) -> list[str]:
             continue
         prefix = re.split(r"[*?\[]", pattern, maxsplit=1)[0].rstrip(".-")
         status, _, body = http(
-            "GET", "https://azuresearch-usnc.nuget.org/autocomplete?"
+            "GET", f"{SEARCH}/autocomplete?"
             + urllib.parse.urlencode({"q": prefix, "take": 1000,
                                       "prerelease": "true", "semVerLevel": "2.0.0"}))
         if status != 200:
@@ -133,7 +175,7 @@ def expand_packages(patterns: list[str]) -> list[str]:
 def published_versions(package_id: str) -> list[str]:
     """Every published version (listed or not), oldest first."""
     status, _, body = http(
-        "GET", f"https://api.nuget.org/v3-flatcontainer/{package_id.lower()}/index.json")
+        "GET", f"{API}/v3-flatcontainer/{package_id.lower()}/index.json")
     if status != 200:
         raise RuntimeError(f"{package_id}: flat-container index returned HTTP {status}")
     return sorted(json.loads(body)["versions"], key=version_sort_key)
@@ -142,7 +184,7 @@ def published_versions(package_id: str) -> list[str]:
 def version_status(package_id: str) -> dict[str, dict]:
     """Normalized version -> {"listed": bool, "deprecated": bool} from the registration index."""
     status, _, body = http(
-        "GET", f"https://api.nuget.org/v3/registration5-gz-semver2/{package_id.lower()}/index.json")
+        "GET", f"{API}/v3/registration5-gz-semver2/{package_id.lower()}/index.json")
     if status != 200:
         raise RuntimeError(f"{package_id}: registration index returned HTTP {status}")
     result: dict[str, dict] = {}
@@ -161,11 +203,151 @@ def version_status(package_id: str) -> dict[str, dict]:
     return result
 
 
-def build_plan(package_ids: list[str], keep: int) -> list[dict]:
+def catalog_time(stamp: str) -> str:
+    """Catalog commit timestamp in a form that compares correctly as a string
+    (the catalog writes a variable number of fractional digits)."""
+    base, _, fraction = stamp.rstrip("Z").partition(".")
+    return f"{base}.{fraction:0<7}Z"
+
+
+def catalog_time_before(stamp: str, delta: datetime.timedelta) -> str:
+    """catalog_time of a commit timestamp moved back by delta."""
+    base, _, fraction = catalog_time(stamp).partition(".")
+    moved = datetime.datetime.strptime(base, "%Y-%m-%dT%H:%M:%S") - delta
+    return f"{moved:%Y-%m-%dT%H:%M:%S}.{fraction}"
+
+
+class PackageIndex:
+    """Local SQLite copy of the tracked packages' versions and their
+    listed/deprecated flags, kept current by following the NuGet catalog.
+
+    Packages are seeded from the registration index the first time they are
+    requested; from then on only catalog pages committed after the saved
+    cursor are downloaded, and only leaves of tracked packages are fetched.
+    A new index starts its cursor CATALOG_SEED_MARGIN before the catalog's
+    head, so commits the registration index had not caught up with yet are
+    replayed over the seeded state.
+    """
+
+    def __init__(self, path: str):
+        self.db = sqlite3.connect(path)
+        self.db.executescript("""
+            CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT NOT NULL);
+            CREATE TABLE IF NOT EXISTS packages (id TEXT PRIMARY KEY COLLATE NOCASE);
+            CREATE TABLE IF NOT EXISTS versions (
+                id TEXT NOT NULL COLLATE NOCASE,
+                version TEXT NOT NULL,
+                listed INTEGER NOT NULL,
+                deprecated INTEGER NOT NULL,
+                PRIMARY KEY (id, version));
+        """)
+
+    @property
+    def cursor(self) -> str | None:
+        row = self.db.execute("SELECT value FROM meta WHERE key = 'cursor'").fetchone()
+        return row[0] if row else None
+
+    def set_cursor(self, stamp: str) -> None:
+        self.db.execute("INSERT OR REPLACE INTO meta VALUES ('cursor', ?)", (stamp,))
+
+    def tracked(self) -> set[str]:
+        return {row[0].lower() for row in self.db.execute("SELECT id FROM packages")}
+
+    def record(self, package_id: str, version: str, listed: bool, deprecated: bool) -> None:
+        self.db.execute("INSERT OR REPLACE INTO versions VALUES (?, ?, ?, ?)",
+                        (package_id, version, int(listed), int(deprecated)))
+
+    def forget(self, package_id: str, version: str) -> None:
+        self.db.execute("DELETE FROM versions WHERE id = ? AND version = ?", (package_id, version))
+
+    def mark(self, package_id: str, versions: list[str], **flags: bool) -> None:
+        """Apply our own unlist/deprecate results before the catalog reports them."""
+        for column, value in flags.items():
+            self.db.executemany(f"UPDATE versions SET {column} = ? WHERE id = ? AND version = ?",
+                                [(int(value), package_id, v.lower()) for v in versions])
+        self.db.commit()
+
+    def seed(self, package_id: str) -> None:
+        """Load a newly tracked package from the registration index."""
+        for version, state in version_status(package_id).items():
+            self.record(package_id, version, state["listed"], state["deprecated"])
+        self.db.execute("INSERT OR IGNORE INTO packages VALUES (?)", (package_id,))
+
+    def sync(self, package_ids: list[str]) -> None:
+        """Seed untracked packages, then replay catalog commits since the cursor."""
+        status, _, body = http("GET", f"{API}/v3/catalog0/index.json")
+        if status != 200:
+            raise RuntimeError(f"catalog index returned HTTP {status}")
+        catalog = json.loads(body)
+        cursor = self.cursor
+        if cursor is None:
+            cursor = catalog_time_before(catalog["commitTimeStamp"], CATALOG_SEED_MARGIN)
+            self.set_cursor(cursor)
+
+        tracked = self.tracked()
+        for package_id in package_ids:
+            if package_id.lower() not in tracked:
+                print(f"index: seeding {package_id} from the registration index")
+                self.seed(package_id)
+        self.db.commit()
+        # After seeding, so commits the registration index had not caught up
+        # with land on top of the seeded state.
+        self.follow(catalog, cursor)
+
+    def follow(self, catalog: dict, cursor: str) -> None:
+        tracked = self.tracked()
+        pages = sorted((p for p in catalog["items"] if catalog_time(p["commitTimeStamp"]) > cursor),
+                       key=lambda p: catalog_time(p["commitTimeStamp"]))
+        applied = 0
+        for page in pages:
+            status, _, body = http("GET", page["@id"])
+            if status != 200:
+                raise RuntimeError(f"catalog page {page['@id']} returned HTTP {status}")
+            items = sorted((i for i in json.loads(body)["items"]
+                            if catalog_time(i["commitTimeStamp"]) > cursor),
+                           key=lambda i: catalog_time(i["commitTimeStamp"]))
+            for item in items:
+                if item["nuget:id"].lower() in tracked:
+                    self.apply(item)
+                    applied += 1
+            # Commit per page so an interrupted sync resumes where it stopped.
+            self.set_cursor(catalog_time(page["commitTimeStamp"]))
+            self.db.commit()
+        print(f"index: {len(pages)} new catalog page(s), {applied} change(s) to tracked packages")
+
+    def apply(self, item: dict) -> None:
+        package_id = item["nuget:id"]
+        version = item["nuget:version"].partition("+")[0].lower()
+        if item["@type"] == "nuget:PackageDelete":
+            self.forget(package_id, version)
+            return
+        status, _, body = http("GET", item["@id"])
+        if status != 200:
+            raise RuntimeError(f"{package_id} {version}: catalog leaf returned HTTP {status}")
+        leaf = json.loads(body)
+        # Older leaves carry no "listed" field; unlisting there shows as the
+        # 1900-01-01 sentinel publish date.
+        listed = leaf.get("listed", not leaf.get("published", "").startswith("1900-"))
+        self.record(package_id, version, listed, "deprecation" in leaf)
+
+    def versions(self, package_id: str) -> list[str]:
+        rows = self.db.execute("SELECT version FROM versions WHERE id = ?", (package_id,))
+        return sorted((row[0] for row in rows), key=version_sort_key)
+
+    def status(self, package_id: str) -> dict[str, dict]:
+        rows = self.db.execute("SELECT version, listed, deprecated FROM versions WHERE id = ?",
+                               (package_id,))
+        return {version: {"listed": bool(listed), "deprecated": bool(deprecated)}
+                for version, listed, deprecated in rows}
+
+
+def build_plan(package_ids: list[str], keep: int, index: PackageIndex | None = None) -> list[dict]:
     plan = []
     for package_id in package_ids:
-        versions = published_versions(package_id)
-        state = version_status(package_id)
+        if index:
+            versions, state = index.versions(package_id), index.status(package_id)
+        else:
+            versions, state = published_versions(package_id), version_status(package_id)
         keep_count = 0 if package_id in DEAD_PACKAGES else min(keep, len(versions))
         retire = versions[:len(versions) - keep_count]
         # Versions already unlisted/deprecated need no further action.
@@ -198,7 +380,7 @@ def show_plan(plan: list[dict], verbose: bool) -> None:
           "(unlist rate limit is 250/hour - the script waits on 429)")
 
 
-def unlist(plan: list[dict], api_key: str) -> int:
+def unlist(plan: list[dict], api_key: str, index: PackageIndex | None = None) -> int:
     done, failed = 0, []
     for entry in plan:
         for version in entry["unlist"]:
@@ -209,75 +391,197 @@ def unlist(plan: list[dict], api_key: str) -> int:
                 if status < 300:
                     done += 1
                     print(f"unlisted {entry['id']} {version}")
+                    if index:
+                        index.mark(entry["id"], [version], listed=False)
                     break
                 if status == 429:
-                    wait = int(headers.get("Retry-After") or 300)
-                    print(f"rate-limited; sleeping {wait}s ({done} done so far)")
+                    wait = retry_after(headers, 300)
+                    print(f"rate-limited; sleeping {wait:.0f}s ({done} done so far)")
                     time.sleep(wait)
                     continue
                 failed.append(f"{entry['id']} {version} -> HTTP {status}")
                 print(f"FAILED: {failed[-1]}", file=sys.stderr)
                 break
-            time.sleep(0.5)
+            time.sleep(UNLIST_INTERVAL)
     print(f"\nUnlisted {done} version(s).")
     if failed:
         print("Failed:\n" + "\n".join(failed), file=sys.stderr)
     return 1 if failed else 0
 
 
-def deprecate(plan: list[dict], cookie: str, message: str) -> int:
-    print("WARNING: using the nuget.org website's internal endpoint (no official "
-          "API exists, see NuGet/NuGetGallery#8873). It may break without notice.",
-          file=sys.stderr)
-    failures = 0
-    for entry in plan:
-        if not entry["deprecate"]:
-            continue
-
-        # The antiforgery form token comes from any Manage page of the package.
-        any_version = (entry["keep"] or entry["retire"])[-1]
-        manage_url = f"{GALLERY}/packages/{entry['id']}/{any_version}/Manage"
-        status, _, page = http("GET", manage_url, headers={"Cookie": cookie})
-        if status != 200:
-            print(f"{entry['id']}: Manage page returned HTTP {status} - cookie "
-                  "expired or not an owner? Skipping.", file=sys.stderr)
-            failures += 1
+class SessionExpired(Exception):
+    """The deprecation cookie no longer authenticates - every further request would fail too."""
+
+
+class Pacer:
+    """Spaces out request starts across worker threads. The interval shrinks
+    while the gallery answers promptly and backs off on 429 / server errors."""
+
+    def __init__(self, interval: float = 1.0, floor: float = 0.25, ceiling: float = 120.0):
+        self.interval, self.floor, self.ceiling = interval, floor, ceiling
+        self.next_slot = 0.0
+        self.lock = threading.Lock()
+
+    def wait(self) -> None:
+        with self.lock:
+            now = time.monotonic()
+            slot = max(now, self.next_slot)
+            self.next_slot = slot + self.interval
+        time.sleep(slot - now)
+
+    def ok(self) -> None:
+        with self.lock:
+            self.interval = max(self.floor, self.interval * 0.8)
+
+    def slow_down(self, at_least: float = 0.0) -> None:
+        with self.lock:
+            self.interval = min(self.ceiling, max(self.interval * 2, at_least))
+            self.next_slot = max(self.next_slot, time.monotonic() + at_least)
+
+
+# Unauthenticated gallery requests get redirected (and urllib follows) to the
+# sign-in page; a logged-in page only ever links LogOff.
+LOGIN_MARKER = "/users/account/LogOn"
+RETRIES = 5
+
+
+def paced_http(pacer: Pacer, abort: threading.Event, method: str, url: str, **kwargs):
+    """http() behind the pacer, retrying 429, 5xx and connection errors with backoff."""
+    for attempt in range(RETRIES):
+        if abort.is_set():
+            raise SessionExpired("aborted")
+        pacer.wait()
+        try:
+            status, headers, body = http(method, url, **kwargs)
+        except (urllib.error.URLError, OSError) as error:
+            status, headers, body = None, {}, str(error)
+        if status == 401 or (status is not None and LOGIN_MARKER in body):
+            raise SessionExpired(f"{method} {url} returned the sign-in page (HTTP {status})")
+        if status == 429:
+            wait = retry_after(headers, 60)
+            print(f"rate-limited; backing off {wait:.0f}s", file=sys.stderr)
+            pacer.slow_down(wait)
             continue
-        token = re.search(r'name="__RequestVerificationToken"[^>]*value="([^"]+)"', page)
-        if not token:
-            print(f"{entry['id']}: no antiforgery token on {manage_url} - skipping.",
-                  file=sys.stderr)
-            failures += 1
+        if status is None or status >= 500:
+            backoff = min(60, 2 ** attempt)
+            print(f"{method} {url}: {status or body} - retrying in {backoff}s", file=sys.stderr)
+            pacer.slow_down(backoff)
             continue
+        pacer.ok()
+        return status, headers, body
+    return status, headers, body
 
-        fields = [
-            ("__RequestVerificationToken", token.group(1)),
-            ("id", entry["id"]),
-            *(("versions", v) for v in entry["deprecate"]),
-            ("isLegacy", "true"),
-            ("hasCriticalBugs", "false"),
-            ("isOther", "false"),
-            ("customMessage", message),
-        ]
-        if entry["alternate"]:
-            fields.append(("alternatePackageId", entry["alternate"]))
 
-        status, _, body = http(
-            "POST", f"{GALLERY}/json/deprecation/deprecate",
-            headers={"Cookie": cookie, "Referer": manage_url,
-                     "Content-Type": "application/x-www-form-urlencoded"},
-            body=urllib.parse.urlencode(fields).encode())
-        if status == 200:
-            print(f"deprecated {entry['id']}: {len(entry['deprecate'])} version(s)")
-        else:
-            print(f"{entry['id']}: deprecation POST returned HTTP {status}: "
-                  f"{body[:200]}", file=sys.stderr)
-            failures += 1
-        time.sleep(2)
+def manage_token(entry: dict, cookie: str, pacer: Pacer, abort: threading.Event) -> tuple[str, str]:
+    """(Manage page URL, antiforgery token) for one package; raises RuntimeError when unusable."""
+    # The antiforgery form token comes from any Manage page of the package.
+    any_version = (entry["keep"] or entry["retire"])[-1]
+    manage_url = f"{GALLERY}/packages/{entry['id']}/{any_version}/Manage"
+    status, _, page = paced_http(pacer, abort, "GET", manage_url, headers={"Cookie": cookie})
+    if status != 200:
+        raise RuntimeError(f"Manage page returned HTTP {status} - not an owner?")
+    token = re.search(r'name="__RequestVerificationToken"[^>]*value="([^"]+)"', page)
+    if not token:
+        raise RuntimeError(f"no antiforgery token on {manage_url}")
+    return manage_url, token.group(1)
+
+
+def deprecate_package(entry: dict, token: Future, cookie: str, message: str,
+                      pacer: Pacer, abort: threading.Event) -> None:
+    manage_url, verification_token = token.result()
+    fields = [
+        ("__RequestVerificationToken", verification_token),
+        ("id", entry["id"]),
+        *(("versions", v) for v in entry["deprecate"]),
+        ("isLegacy", "true"),
+        ("hasCriticalBugs", "false"),
+        ("isOther", "false"),
+        ("customMessage", message),
+    ]
+    if entry["alternate"]:
+        fields.append(("alternatePackageId", entry["alternate"]))
+
+    status, _, body = paced_http(
+        pacer, abort, "POST", f"{GALLERY}/json/deprecation/deprecate",
+        headers={"Cookie": cookie, "Referer": manage_url,
+                 "Content-Type": "application/x-www-form-urlencoded"},
+        body=urllib.parse.urlencode(fields).encode())
+    if status != 200:
+        raise RuntimeError(f"deprecation POST returned HTTP {status}: {body[:200]}")
+
+
+def deprecate(plan: list[dict], cookie: str, message: str,
+              index: PackageIndex | None = None, jobs: int = 2) -> int:
+    """Deprecate every package's retired versions, pipelined: the Manage pages
+    (and antiforgery tokens) of the next `jobs` packages are prefetched while
+    earlier POSTs are in flight, at most `jobs` requests of each kind run at
+    once. A package is only queued when an earlier one finishes, so the page
+    fetches never run further ahead of the POSTs sharing the pacer."""
+    print("WARNING: using the nuget.org website's internal endpoint (no official "
+          "API exists, see NuGet/NuGetGallery#8873). It may break without notice.",
+          file=sys.stderr)
+    pending = [entry for entry in plan if entry["deprecate"]]
+    pacer, abort = Pacer(), threading.Event()
+    failures, expired, done = 0, None, set()
+    queue = iter(pending)
+    futures: dict[Future, tuple[dict, Future]] = {}  # POST -> (entry, its token)
+    with ThreadPoolExecutor(jobs) as prefetch, ThreadPoolExecutor(jobs) as posts:
+        def submit_next() -> None:
+            entry = next(queue, None)
+            if entry is None or abort.is_set():
+                return
+            token = prefetch.submit(manage_token, entry, cookie, pacer, abort)
+            post = posts.submit(deprecate_package, entry, token, cookie, message, pacer, abort)
+            futures[post] = entry, token
+
+        # `jobs` packages posting plus `jobs` more prefetching their tokens.
+        for _ in range(2 * jobs):
+            submit_next()
+        while futures:
+            finished, _ = wait(futures, return_when=FIRST_COMPLETED)
+            for future in finished:
+                entry, _ = futures.pop(future)
+                try:
+                    future.result()
+                except SessionExpired as error:
+                    if expired is None:
+                        expired = error
+                        abort.set()
+                        for other, (_, token) in futures.items():
+                            token.cancel()
+                            other.cancel()
+                    continue
+                except CancelledError:
+                    continue
+                except RuntimeError as error:
+                    print(f"{entry['id']}: {error} - skipping.", file=sys.stderr)
+                    failures += 1
+                    continue
+                print(f"deprecated {entry['id']}: {len(entry['deprecate'])} version(s)")
+                if index:
+                    index.mark(entry["id"], entry["deprecate"], deprecated=True)
+                done.add(entry["id"])
+            # Refill after handling, so an expired session queues nothing more.
+            for _ in finished:
+                submit_next()
+    if expired:
+        remaining = [entry["id"] for entry in pending if entry["id"] not in done]
+        print(f"ABORTED: the nuget.org session expired ({expired}). Copy a fresh Cookie "
+              f"header and rerun; {len(remaining)} package(s) still need deprecating: "
+              + ", ".join(remaining), file=sys.stderr)
+        return 1
     return 1 if failures else 0
 
 
+def positive_int(value: str) -> int:
+    number = int(value)
+    if number < 1:
+        raise argparse.ArgumentTypeError(f"must be at least 1, got {value}")
+    return number
+
+
 def main() -> int:
+    global GALLERY, API, SEARCH
     parser = argparse.ArgumentParser(
         description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
     parser.add_argument("action", nargs="?", default="plan",
@@ -298,21 +602,37 @@ def main() -> int:
                         help="deprecation custom message (shown on nuget.org)")
     parser.add_argument("--verbose", action="store_true",
                         help="list every version to retire in the plan")
+    parser.add_argument("--jobs", type=positive_int, default=2,
+                        help="deprecate: packages in flight at once (default 2)")
+    parser.add_argument("--index", metavar="FILE",
+                        help="plan from a local SQLite package-state index, synced "
+                             "incrementally from the NuGet catalog (created if missing)")
+    parser.add_argument("--source", metavar="URL",
+                        help="base URL replacing the gallery, API and search hosts "
+                             "(a local stand-in server)")
     args = parser.parse_args()
 
-    plan = build_plan(expand_packages(args.packages), args.keep)
+    if args.source:
+        GALLERY = API = SEARCH = args.source.rstrip("/")
+
+    package_ids = expand_packages(args.packages)
+    index = None
+    if args.index:
+        index = PackageIndex(args.index)
+        index.sync(package_ids)
+    plan = build_plan(package_ids, args.keep, index)
     show_plan(plan, args.verbose)
 
     if args.action == "unlist":
         if not args.api_key:
             parser.error("unlist needs --api-key or NUGET_UNLIST_KEY "
                          "(classic key with the Unlist scope; Trusted Publishing keys are push-only)")
-        return unlist(plan, args.api_key)
+        return unlist(plan, args.api_key, index)
     if args.action == "deprecate":
         if not args.cookie:
             parser.error("deprecate needs --cookie or NUGET_COOKIE "
                          "(full Cookie header from a logged-in nuget.org browser session)")
-        return deprecate(plan, args.cookie, args.message)
+        return deprecate(plan, args.cookie, args.message, index, args.jobs)
     return 0
 
 
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""Offline benchmark for scripts/nuget_retire.py.
+
+Runs each nuget_retire action against a fresh scripts/fake_gallery.py server
+holding a synthetic package set, and reports what the run cost: requests
+issued, 429 answers, bytes transferred and wall time. Nothing touches
+nuget.org, so performance changes to nuget_retire.py can be compared before
+and after (--json writes the numbers for diffing).
+
+  plan             autocomplete expansion + flat-container/registration reads
+  plan-index-cold  --index against an empty index (seed + catalog cursor)
+  plan-index-warm  --index again after an unlist, a deprecation and a new
+                   version: catalog pages since cursor
+  unlist           plan + DELETE every retired version (429s included)
+  deprecate        plan + Manage page/token + POST per package
+  deprecate-throttled  deprecate against a rate-limited, flaky website
+                   (--deprecate-limit/--deprecate-window 429s with an
+                   HTTP-date Retry-After, a 503 every --fail-every requests):
+                   measures the pacer's back-off and retries
+
+Both index scenarios fail unless the indexed plan equals the plan built from
+the live endpoints afterwards.
+
+The fixed pause between unlists (nuget_retire.UNLIST_INTERVAL) is zeroed by
+default so wall time reflects request cost; --real-delays keeps it.
+
+Usage:
+  uv run poe nuget-retire-bench
+  uv run poe nuget-retire-bench --packages 20 --versions 500 --json bench.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import fake_gallery  # noqa: E402
+import nuget_retire  # noqa: E402
+
+SCENARIOS = ["plan", "plan-index-cold", "plan-index-warm", "unlist", "deprecate", "deprecate-throttled"]
+
+
+def point_at(gallery: fake_gallery.FakeGallery) -> None:
+    nuget_retire.GALLERY = nuget_retire.API = nuget_retire.SEARCH = gallery.url
+
+
+def plan(keep: int, index: nuget_retire.PackageIndex | None = None) -> list[dict]:
+    package_ids = nuget_retire.expand_packages(nuget_retire.DEFAULT_PACKAGES)
+    if index:
+        index.sync(package_ids)
+    return nuget_retire.build_plan(package_ids, keep, index)
+
+
+def run_scenario(name: str, args, workdir: str) -> dict:
+    packages = fake_gallery.synthetic_packages(args.packages, args.versions)
+    throttled = name == "deprecate-throttled"
+    with fake_gallery.FakeGallery(packages, unlist_limit=args.unlist_limit,
+                                  unlist_window=args.unlist_window,
+                                  deprecate_limit=args.deprecate_limit if throttled else 0,
+                                  deprecate_window=args.deprecate_window,
+                                  fail_every=args.fail_every if throttled else 0) as gallery:
+        point_at(gallery)
+        index = None
+        if name.startswith("plan-index"):
+            index = nuget_retire.PackageIndex(os.path.join(workdir, f"{name}.sqlite"))
+        if name == "plan-index-warm":
+            # Prime the index, then unlist, deprecate and publish behind its
+            # back so the sync has a catalog delta to follow.
+            with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+                plan(args.keep, index)
+                entry = next(e for e in plan(args.keep) if e["unlist"])
+                nuget_retire.unlist([{**entry, "unlist": entry["unlist"][:1]}], "fake-key")
+                nuget_retire.deprecate([{**entry, "deprecate": entry["deprecate"][-1:]}],
+                                       fake_gallery.COOKIE, "benchmark")
+                gallery.publish(entry["id"], "9.0.0")
+
+        gallery.reset_stats()
+        log = io.StringIO()
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(log), contextlib.redirect_stderr(log):
+            result = plan(args.keep, index)
+            if name == "unlist":
+                exit_code = nuget_retire.unlist(result, "fake-key")
+            elif name in ("deprecate", "deprecate-throttled"):
+                exit_code = nuget_retire.deprecate(result, fake_gallery.COOKIE, "benchmark",
+                                                   jobs=args.jobs)
+            else:
+                exit_code = 0
+        wall = time.perf_counter() - start
+        stats = dict(gallery.stats)
+        if index and not exit_code:
+            # The index must plan exactly what the live endpoints plan.
+            with contextlib.redirect_stdout(io.StringIO()):
+                live = plan(args.keep)
+            mismatched = [entry["id"] for entry, expected in zip(result, live) if entry != expected]
+            if mismatched:
+                log.write(f"indexed plan differs from the live plan for: {', '.join(mismatched)}\n")
+                exit_code = 1
+    if exit_code:
+        print(f"{name}: nuget_retire exited {exit_code}\n{log.getvalue()[-2000:]}",
+              file=sys.stderr)
+    return {"scenario": name, "exit_code": exit_code, "wall_seconds": round(wall, 3),
+            "versions": sum(len(e["retire"]) + len(e["keep"]) for e in result), **stats}
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("scenarios", nargs="*", default=SCENARIOS, metavar="SCENARIO",
+                        help=f"scenarios to run (default: all of {', '.join(SCENARIOS)})")
+    parser.add_argument("--packages", type=int, default=12, help="package ids (default 12)")
+    parser.add_argument("--versions", type=int, default=300, help="versions per package (default 300)")
+    parser.add_argument("--keep", type=int, default=2, help="nuget_retire --keep (default 2)")
+    parser.add_argument("--jobs", type=nuget_retire.positive_int, default=2,
+                        help="nuget_retire --jobs (default 2)")
+    parser.add_argument("--unlist-limit", type=int, default=1000,
+                        help="fake unlists per window before 429 (default 1000)")
+    parser.add_argument("--unlist-window", type=float, default=2.0,
+                        help="fake unlist rate-limit window in seconds (default 2)")
+    parser.add_argument("--deprecate-limit", type=int, default=2,
+                        help="deprecate-throttled: fake Manage/POST requests per window "
+                             "before 429 (default 2)")
+    parser.add_argument("--deprecate-window", type=float, default=1.0,
+                        help="deprecate-throttled: rate-limit window in seconds (default 1)")
+    parser.add_argument("--fail-every", type=int, default=7, metavar="N",
+                        help="deprecate-throttled: 503 on every Nth Manage/POST request (default 7)")
+    parser.add_argument("--real-delays", action="store_true",
+                        help="keep nuget_retire's fixed pause between unlists")
+    parser.add_argument("--json", metavar="FILE", help="also write the results as JSON")
+    args = parser.parse_args()
+
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenario(s): {', '.join(sorted(unknown))}")
+    if not args.real_delays:
+        nuget_retire.UNLIST_INTERVAL = 0
+
+    print(f"{args.packages} packages x {args.versions} versions, keep {args.keep}\n")
+    print(f"{'scenario':<19} {'requests':>9} {'429s':>6} {'5xx':>5} {'KiB down':>10} {'KiB up':>8} {'wall s':>8}")
+    results = []
+    with tempfile.TemporaryDirectory() as workdir:
+        for name in args.scenarios:
+            row = run_scenario(name, args, workdir)
+            results.append(row)
+            print(f"{name:<19} {row['requests']:>9} {row['rate_limited']:>6} {row['server_errors']:>5} "
+                  f"{row['bytes_out'] / 1024:>10.1f} {row['bytes_in'] / 1024:>8.1f} "
+                  f"{row['wall_seconds']:>8.2f}")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"packages": args.packages, "versions": args.versions, "keep": args.keep,
+                       "results": results}, f, indent=2)
+    return 1 if any(row["exit_code"] for row in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""List the locally packed .nupkg files that actually need pushing to nuget.org.
+
+The platform packages (2dog.linux-x64/win-x64/osx-arm64 variants, 25-77 MB
+each) are packed on every release, but their NativesVersion is only bumped
+when the natives change - so most releases re-upload packages nuget.org
+already has, just for the push to be rejected as a duplicate.
+
+A package needs pushing unless its id and version is already on nuget.org,
+which costs one small flat-container index request per package (pushing a
+published version would only be rejected as a duplicate).
+
+--verify also checks that the published package carries the same payload,
+reduced to a payload hash: SHA-256 over the sorted entry names and entry
+contents, ignoring zip timestamps/ordering and the files NuGet regenerates
+on every pack or publish ([Content_Types].xml, _rels/, package/services/
+core properties, the nuspec and nuget.org's .signature.p7s). Published
+hashes come from the --manifest file when it knows them (free; published
+packages are immutable, so the manifest never goes stale), otherwise the
+published package is downloaded in full (25-77 MB for the platform
+packages), hashed and recorded in the manifest. A package whose version is
+published with a *different* payload is reported as an error: its push
+would be skipped as a duplicate and keep the stale natives - bump
+<NativesRevision> in Directory.Build.props. CI's pack job already refuses
+that case by comparing the submodule commit stamped into the package, so
+--verify is a local double check.
+
+The packages to push are printed one path per line on stdout; everything
+else goes to stderr:
+
+  uv run poe nupkg-dedup                              # all of packages/
+  uv run poe nupkg-dedup packages/2dog.win-x64*.nupkg --verify --manifest natives.json
+  for pkg in $(uv run scripts/nupkg_dedup.py); do dotnet nuget push "$pkg" ...; done
+"""
+
+from __future__ import annotations
+
+import argparse
+import glob
+import hashlib
+import io
+import json
+import os
+import re
+import sys
+import zipfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import nuget_retire  # noqa: E402
+from nuget_retire import http  # noqa: E402
+
+# Entries NuGet writes per pack (random .psmdcp name, timestamps) or adds on
+# publish (repository signature); the nuspec is read for id/version instead.
+IGNORED = re.compile(r"^(\[Content_Types\]\.xml|_rels/.*|package/.*|\.signature\.p7s|[^/]+\.nuspec)$",
+                     re.IGNORECASE)
+CHUNK = 1 << 20
+
+
+def package_identity(archive: zipfile.ZipFile) -> tuple[str, str]:
+    """(id, normalized lowercase version) from the package's nuspec."""
+    nuspec = next(n for n in archive.namelist() if "/" not in n and n.lower().endswith(".nuspec"))
+    text = archive.read(nuspec).decode("utf-8-sig")
+    package_id = re.search(r"<id>\s*([^<]+?)\s*</id>", text).group(1)
+    version = re.search(r"<version>\s*([^<]+?)\s*</version>", text).group(1)
+    return package_id, version.partition("+")[0].lower()
+
+
+def payload_hash(archive: zipfile.ZipFile) -> str:
+    """Deterministic hash of the package payload (see module docstring)."""
+    digest = hashlib.sha256()
+    for name in sorted(n for n in archive.namelist() if not n.endswith("/") and not IGNORED.match(n)):
+        entry = hashlib.sha256()
+        with archive.open(name) as f:
+            while chunk := f.read(CHUNK):
+                entry.update(chunk)
+        digest.update(f"{name}\0{entry.hexdigest()}\n".encode())
+    return digest.hexdigest()
+
+
+def is_published(package_id: str, version: str) -> bool:
+    lower = package_id.lower()
+    status, _, body = http("GET", f"{nuget_retire.API}/v3-flatcontainer/{lower}/index.json")
+    if status == 404:  # the id was never published
+        return False
+    if status != 200:
+        raise RuntimeError(f"{package_id}: flat-container index returned HTTP {status}")
+    return version in json.loads(body)["versions"]
+
+
+def published_hash(package_id: str, version: str) -> str:
+    """Payload hash of the published package (downloads all of it)."""
+    lower = package_id.lower()
+    status, _, body = http(
+        "GET", f"{nuget_retire.API}/v3-flatcontainer/{lower}/{version}/{lower}.{version}.nupkg",
+        binary=True)
+    if status != 200:
+        raise RuntimeError(f"{package_id} {version}: package download returned HTTP {status}")
+    with zipfile.ZipFile(io.BytesIO(body)) as archive:
+        return payload_hash(archive)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("packages", nargs="*", metavar="NUPKG",
+                        help="packages to check (default: packages/*.nupkg)")
+    parser.add_argument("--verify", action="store_true",
+                        help="compare published packages' payloads with the local ones "
+                             "(downloads each one the manifest does not know)")
+    parser.add_argument("--manifest", metavar="FILE",
+                        help="JSON cache of published payload hashes ({\"id/version\": hash}), "
+                             "created or extended as packages are downloaded")
+    parser.add_argument("--source", metavar="URL",
+                        help="base URL replacing api.nuget.org (a local stand-in server)")
+    args = parser.parse_args()
+
+    if args.source:
+        nuget_retire.API = args.source.rstrip("/")
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    paths = args.packages or sorted(glob.glob(os.path.join(root, "packages", "*.nupkg")))
+
+    manifest: dict[str, str] = {}
+    if args.manifest and os.path.exists(args.manifest):
+        with open(args.manifest, encoding="utf-8") as f:
+            manifest = json.load(f)
+
+    to_push, conflicts, unknown = [], [], []
+    for path in paths:
+        with zipfile.ZipFile(path) as archive:
+            package_id, version = package_identity(archive)
+            local = payload_hash(archive) if args.verify else None
+        key = f"{package_id.lower()}/{version}"
+        published = manifest.get(key)
+        if published is None:
+            try:
+                if not is_published(package_id, version):
+                    print(f"push  {package_id} {version}: not published yet", file=sys.stderr)
+                    to_push.append(path)
+                    continue
+                if not args.verify:
+                    print(f"skip  {package_id} {version}: already published", file=sys.stderr)
+                    continue
+                published = manifest[key] = published_hash(package_id, version)
+            except (OSError, RuntimeError) as e:  # network error or 5xx: not the same as unpublished
+                print(f"ERROR {package_id} {version}: cannot check nuget.org ({e})", file=sys.stderr)
+                unknown.append(path)
+                continue
+        if not args.verify:
+            print(f"skip  {package_id} {version}: already published", file=sys.stderr)
+        elif published == local:
+            print(f"skip  {package_id} {version}: published payload is identical", file=sys.stderr)
+        else:
+            print(f"ERROR {package_id} {version}: already published with a different payload - "
+                  "bump <NativesRevision> in Directory.Build.props", file=sys.stderr)
+            conflicts.append(path)
+
+    if args.manifest:
+        with open(args.manifest, "w", encoding="utf-8") as f:
+            json.dump(dict(sorted(manifest.items())), f, indent=2)
+            f.write("\n")
+
+    print(f"{len(to_push)} of {len(paths)} package(s) need pushing", file=sys.stderr)
+    for path in to_push:
+        print(path)
+    return 1 if conflicts or unknown else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())